@@ -0,0 +1,132 @@
+"""
+启动耗时基准测试：每个场景在新的 Python 进程里运行，测从启动到退出的总耗时
+
+场景:
+    validate  只做配置校验（没有凭据，真实 CLI 直接退出），不应加载 requests / Playwright / PyNaCl
+    http      HTTP 快速保活需要的模块：CLI + requests + 写 Secret 用的 PyNaCl
+    browser   完整浏览器流程：再加上 Playwright
+    eager     对照组：拆分前的做法，启动时就导入 requests 和 Playwright，再做配置校验
+
+用法:
+    python benchmarks/bench_import.py          # 每个场景跑 10 次，输出中位耗时
+    python benchmarks/bench_import.py -n 30
+
+validate 场景加载了重量级模块时退出码为 1。
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = os.path.abspath(os.path.join(HERE, "..", "scripts"))
+
+HEAVY = ("requests", "playwright", "nacl")
+
+# 配置校验：没有凭据时 run_accounts 不会启动浏览器，也不发任何请求
+VALIDATE = """
+from clawcloud import cli
+try:
+    cli.main()
+except SystemExit:
+    pass
+"""
+
+SCENARIOS = {
+    "validate": VALIDATE,
+    "http": """
+from clawcloud import cli
+from clawcloud.http_keepalive import HttpKeepalive
+from clawcloud.session_probe import SessionProbe
+import nacl.public
+HttpKeepalive({}, "https://example.invalid", "bench")
+SessionProbe({}, "", "https://example.invalid", "bench")
+""",
+    "browser": """
+from clawcloud import cli
+from clawcloud.http_keepalive import HttpKeepalive
+import nacl.public
+from playwright.async_api import async_playwright
+HttpKeepalive({}, "https://example.invalid", "bench")
+""",
+    "eager": """
+import requests
+import nacl.public
+from playwright.async_api import async_playwright
+""" + VALIDATE,
+}
+
+# 子进程结束前报告加载了哪些重量级模块
+REPORT = """
+import sys
+print("loaded=" + ",".join(m for m in %r if m in sys.modules))
+""" % (HEAVY,)
+
+
+def run_once(code, env):
+    """运行一次，返回 (耗时秒数, 加载的重量级模块)"""
+    t0 = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", code + REPORT],
+        cwd=SCRIPTS, env=env, capture_output=True, text=True,
+    )
+    seconds = time.perf_counter() - t0
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip() or out.stdout.strip())
+    loaded = ""
+    for line in out.stdout.splitlines():
+        if line.startswith("loaded="):
+            loaded = line[len("loaded="):]
+    return seconds, [m for m in loaded.split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ClawCloud 启动耗时基准测试")
+    parser.add_argument("-n", "--runs", type=int, default=10, help="每个场景运行次数")
+    args = parser.parse_args()
+
+    state_dir = tempfile.mkdtemp(prefix="clawcloud-import-")
+    # 没有凭据、不发通知、不写 Secret、不读写真实缓存
+    env = {k: v for k, v in os.environ.items()
+           if not k.startswith(("GH_", "TG_", "REPO_TOKEN", "PROXY_DSN"))}
+    env.update({"STATE_DIR": state_dir, "TIMELINE_FILE": "", "PYTHONDONTWRITEBYTECODE": "1"})
+
+    # 解释器本身的启动时间，结果里减掉
+    floor = statistics.median(run_once("pass", env)[0] for _ in range(args.runs))
+
+    rows = {}
+    try:
+        for name, code in SCENARIOS.items():
+            try:
+                run_once(code, env)  # 预热文件系统缓存
+                timings, loaded = [], []
+                for _ in range(args.runs):
+                    seconds, loaded = run_once(code, env)
+                    timings.append(seconds)
+            except RuntimeError as e:
+                print(f"⚠️ {name}: 无法运行（{str(e).splitlines()[-1] if str(e) else e}）")
+                continue
+            rows[name] = (statistics.median(timings) - floor, loaded)
+    finally:
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+    print(f"\n解释器启动: {floor * 1000:.0f}ms（以下已扣除）")
+    print("场景        中位      加载的重量级模块")
+    for name, (seconds, loaded) in rows.items():
+        print(f"{name:<10} {seconds * 1000:>6.0f}ms   {', '.join(loaded) or '-'}")
+    if "validate" in rows and "eager" in rows:
+        saved = rows["eager"][0] - rows["validate"][0]
+        print(f"\n配置校验比立即导入快 {saved * 1000:.0f}ms")
+
+    if rows.get("validate", (0, []))[1]:
+        print(f"\n❌ 配置校验加载了: {', '.join(rows['validate'][1])}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
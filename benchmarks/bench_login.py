@@ -0,0 +1,182 @@
+"""
+登录流程基准测试（本地模拟服务，不访问 github.com / claw.cloud）
+
+用法:
+    python benchmarks/bench_login.py                    # 每条路径跑 3 次
+    python benchmarks/bench_login.py -n 5 --paths password,totp
+    python benchmarks/bench_login.py --update-baseline  # 记录当前结果为基线
+
+每条路径的中位耗时超过基线 (1 + --tolerance) 倍且多出 --slack 秒以上时，退出码为 1。
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "scripts"))
+sys.path.insert(0, HERE)
+
+from mock_server import PASSWORD, MockServer, valid_session  # noqa: E402
+
+BASELINE_FILE = os.path.join(HERE, "baseline.json")
+
+# 路径 -> (账号名, 是否带有效 GH_SESSION)
+PATHS = {
+    "cookie": ("cookie-user", True),
+    "password": ("password-user", False),
+    "device": ("device-user", False),
+    "totp": ("totp-user", False),
+    "mobile": ("mobile-user", False),
+    "oauth": ("oauth-user", False),
+}
+
+
+class MockBrowser:
+    """包装 Browser：新建的上下文都把请求转发到模拟服务"""
+
+    def __init__(self, browser, server):
+        self.browser = browser
+        self.server = server
+
+    async def new_context(self, **kwargs):
+        context = await self.browser.new_context(**kwargs)
+        await context.route("**/*", lambda route: self.server.forward(context, route))
+        return context
+
+
+async def run_path(clawcloud, browser, tg, secret, path):
+    username, with_session = PATHS[path]
+    al = clawcloud.AutoLogin(
+        username=username,
+        password=PASSWORD,
+        gh_session=valid_session(username) if with_session else "",
+        secret_name=f"GH_SESSION_{clawcloud.secret_key(username)}",
+        tg=tg,
+        secret=secret,
+    )
+    t0 = time.monotonic()
+    result = await al.login(browser)
+    seconds = time.monotonic() - t0
+    if not result["ok"]:
+        raise RuntimeError(f"{path} 失败: {result['error']}")
+    return seconds, al.timeline.meta.get("path")
+
+
+async def bench(server, paths, runs):
+    from playwright.async_api import async_playwright
+
+    import clawcloud
+
+    tg = clawcloud.Telegram()
+    secret = clawcloud.SecretUpdater()
+    timings = {p: [] for p in paths}
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(**clawcloud.launch_options())
+        try:
+            for path in paths:
+                for i in range(runs):
+                    # 每次都从冷状态开始
+                    shutil.rmtree(os.environ["STATE_DIR"], ignore_errors=True)
+                    server.state.reset()
+                    seconds, taken = await run_path(clawcloud, MockBrowser(browser, server), tg, secret, path)
+                    timings[path].append(seconds)
+                    print(f"  {path} #{i + 1}: {seconds:.2f}s（{taken}）")
+        finally:
+            await browser.close()
+    tg.flush(timeout=10)
+    return timings
+
+
+def report(timings):
+    rows = {}
+    print("\n路径        次数   最快     中位     p95")
+    for path, ts in timings.items():
+        ts = sorted(ts)
+        p95 = ts[min(len(ts) - 1, int(round(0.95 * (len(ts) - 1))))]
+        rows[path] = {"runs": len(ts), "min": round(ts[0], 3), "median": round(statistics.median(ts), 3),
+                      "p95": round(p95, 3)}
+        r = rows[path]
+        print(f"{path:<10} {r['runs']:>4} {r['min']:>7.2f}s {r['median']:>7.2f}s {r['p95']:>7.2f}s")
+    return rows
+
+
+def compare(rows, tolerance, slack):
+    """和基线比较，返回回退的路径列表"""
+    try:
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        print(f"\n没有基线文件 {BASELINE_FILE}，跳过比较（可用 --update-baseline 生成）")
+        return []
+
+    regressed = []
+    for path, r in rows.items():
+        base = baseline.get(path)
+        if not base:
+            continue
+        limit = max(base["median"] * (1 + tolerance), base["median"] + slack)
+        status = "✅" if r["median"] <= limit else "❌"
+        print(f"{status} {path}: 中位 {r['median']:.2f}s，基线 {base['median']:.2f}s，上限 {limit:.2f}s")
+        if r["median"] > limit:
+            regressed.append(path)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ClawCloud 登录流程基准测试")
+    parser.add_argument("-n", "--runs", type=int, default=3, help="每条路径运行次数")
+    parser.add_argument("--paths", default=",".join(PATHS), help="要测试的路径，逗号分隔")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="允许比基线慢的比例")
+    parser.add_argument("--slack", type=float, default=1.0, help="允许比基线慢的绝对秒数")
+    parser.add_argument("--update-baseline", action="store_true", help="把本次结果写为基线")
+    args = parser.parse_args()
+
+    paths = [p.strip() for p in args.paths.split(",") if p.strip()]
+    unknown = set(paths) - set(PATHS)
+    if unknown:
+        parser.error(f"未知路径: {', '.join(sorted(unknown))}")
+
+    state_dir = tempfile.mkdtemp(prefix="clawcloud-bench-")
+    with MockServer() as server:
+        # 必须在导入 clawcloud 子模块之前设置
+        os.environ.update({
+            "TG_BOT_TOKEN": "bench",
+            "TG_CHAT_ID": "1",
+            "TG_API_BASE": server.telegram_base,
+            "STATE_DIR": state_dir,
+            "STATE_KEY": "",
+            "FAST_KEEPALIVE": "0",
+            "SESSION_PROBE": "0",
+            "TIMELINE_FILE": "",
+            "TWO_FACTOR_WAIT": "30",
+            "PROXY_DSN": "",
+        })
+        os.environ.pop("REPO_TOKEN", None)
+        print(f"模拟服务: 127.0.0.1:{server.port}")
+        try:
+            timings = asyncio.run(bench(server, paths, args.runs))
+        finally:
+            shutil.rmtree(state_dir, ignore_errors=True)
+
+    rows = report(timings)
+    if args.update_baseline:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\n已写入基线 {BASELINE_FILE}")
+        return
+
+    regressed = compare(rows, args.tolerance, args.slack)
+    if regressed:
+        print(f"\n❌ 性能回退: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""
+本地模拟服务：ClawCloud 登录页 + GitHub OAuth + 区域控制台 + Telegram Bot API
+- 一个 HTTP 服务按 Host 头区分 github.com / console.run.claw.cloud / *.console.claw.cloud
+- 浏览器里的 https 请求由 forward() 转发到这里（见 bench_login.py）
+- /telegram/bot<token>/<method> 模拟 Bot API：收到验证码提示后自动回复 /code <账号> 123456
+- 账号名前缀决定 GitHub 登录路径：device-* 设备验证，totp-* 两步验证码，mobile-* GitHub Mobile 批准，
+  oauth-* 首次授权（显示 Authorize 按钮），其它直接通过
+"""
+
+import asyncio
+import http.client
+import json
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+PASSWORD = "bench-password"
+TOTP_CODE = "123456"
+DEVICE_DELAY = 1.0  # 设备验证“批准”所需秒数
+MOBILE_DELAY = 1.0  # GitHub Mobile “在手机上批准”所需秒数
+REGION_HOST = "ap-southeast-1.console.claw.cloud"
+ENTRY_HOST = "console.run.claw.cloud"
+AUTHORIZE_URL = f"https://github.com/login/oauth/authorize?client_id=claw&redirect_uri=https://{ENTRY_HOST}/login/callback"
+
+PAGE = """<!doctype html><html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>{body}</body></html>"""
+
+
+def valid_session(username):
+    return f"valid-{username}"
+
+
+class MockState:
+    """跨请求共享的模拟状态"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.device_seen = {}  # 账号 -> 第一次看到设备验证页的时间
+        self.mobile_seen = {}  # 账号 -> 第一次看到 GitHub Mobile 页的时间
+        self.authorized = set()  # 已授权应用的账号（oauth-* 账号第一次需要点 Authorize）
+        self.updates = []  # Telegram: (可见时间, update)
+        self.update_id = 100
+        self.message_id = 1000
+        self.hits = {}  # (host, path) -> 次数
+
+    def reset(self):
+        with self.lock:
+            self.device_seen.clear()
+            self.mobile_seen.clear()
+            self.authorized.clear()
+            self.updates.clear()
+            self.hits.clear()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None  # 由 MockServer 注入
+
+    def log_message(self, fmt, *args):
+        pass
+
+    # ---------- 工具 ----------
+
+    def cookies(self):
+        c = SimpleCookie(self.headers.get("Cookie", ""))
+        return {k: v.value for k, v in c.items()}
+
+    def form(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        ctype = self.headers.get("Content-Type", "")
+        if ctype.startswith("multipart/form-data"):
+            msg = BytesParser(policy=HTTP).parsebytes(
+                f"Content-Type: {ctype}\r\n\r\n".encode() + raw
+            )
+            out = {}
+            for part in msg.iter_parts():
+                name = part.get_param("name", header="content-disposition")
+                if name and not part.get_filename():
+                    out[name] = part.get_content()
+            return out
+        return {k: v[0] for k, v in parse_qs(raw.decode()).items()}
+
+    def reply(self, status=200, body="", headers=None, ctype="text/html; charset=utf-8"):
+        data = body.encode() if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or []):
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def page(self, title, body, headers=None):
+        self.reply(200, PAGE.format(title=title, body=body), headers)
+
+    def redirect(self, location, headers=None):
+        self.reply(302, "", [("Location", location)] + list(headers or []))
+
+    def json(self, data):
+        self.reply(200, json.dumps(data), ctype="application/json")
+
+    # ---------- 分发 ----------
+
+    def do_GET(self):
+        self.dispatch()
+
+    def do_POST(self):
+        self.dispatch()
+
+    def dispatch(self):
+        url = urlparse(self.path)
+        host = (self.headers.get("Host") or "").split(":")[0]
+        with self.state.lock:
+            key = (host, url.path)
+            self.state.hits[key] = self.state.hits.get(key, 0) + 1
+
+        if url.path.startswith("/telegram/"):
+            return self.telegram(url)
+        if host == "github.com":
+            return self.github(url)
+        if host == ENTRY_HOST:
+            return self.entry(url)
+        if host.endswith(".console.claw.cloud"):
+            return self.region(url)
+        self.reply(404, "not found")
+
+    # ---------- ClawCloud ----------
+
+    def entry(self, url):
+        if url.path == "/login/signin":
+            return self.page("Sign in", f"""
+                <h1>ClawCloud Run</h1>
+                <button onclick="location.href='{AUTHORIZE_URL}'">Continue with GitHub</button>""")
+        if url.path == "/login/callback":
+            return self.redirect(
+                f"https://{REGION_HOST}/",
+                [("Set-Cookie", "claw_session=ok; Domain=.claw.cloud; Path=/")],
+            )
+        return self.redirect(f"https://{ENTRY_HOST}/login/signin")
+
+    def region(self, url):
+        if self.cookies().get("claw_session") != "ok":
+            return self.redirect(f"https://{ENTRY_HOST}/login/signin")
+        if url.path == "/api/apps":
+            return self.json({"apps": [{"name": "demo"}]})
+        # 控制台页面加载后请求应用列表接口，登录流程以它的返回作为就绪信号
+        script = "<script>fetch('/api/apps')</script>"
+        if url.path == "/apps":
+            return self.page("Apps", '<div class="app-list"><div class="app">demo</div></div>' + script)
+        return self.page("Console", '<nav><a href="/apps">Apps</a></nav>' + script)
+
+    # ---------- GitHub ----------
+
+    def github_user(self):
+        token = self.cookies().get("user_session", "")
+        return token[len("valid-"):] if token.startswith("valid-") else None
+
+    def signed_in(self, username, return_to):
+        return self.redirect(return_to or AUTHORIZE_URL, [
+            ("Set-Cookie", f"user_session={valid_session(username)}; Path=/"),
+            ("Set-Cookie", "logged_in=yes; Path=/"),
+        ])
+
+    def github(self, url):
+        path = url.path
+        cookies = self.cookies()
+        return_to = unquote(cookies.get("return_to", "")) or AUTHORIZE_URL
+
+        if path == "/login/oauth/authorize":
+            user = self.github_user()
+            if user and user.startswith("oauth") and user not in self.state.authorized:
+                if self.command == "POST" and self.form().get("authorize") == "1":
+                    with self.state.lock:
+                        self.state.authorized.add(user)
+                else:
+                    # 第一次授权：显示授权页
+                    return self.page("Authorize application", f"""
+                        <h1>Authorize ClawCloud</h1>
+                        <form action="{self.path}" method="post">
+                          <button type="submit" name="authorize" value="1">Authorize claw</button>
+                        </form>""")
+            if user:
+                # 已授权过的应用直接跳回回调
+                return self.redirect(f"https://{ENTRY_HOST}/login/callback?code=bench")
+            target = f"https://github.com{self.path}"
+            return self.redirect(f"https://github.com/login?return_to={quote(target, safe='')}",
+                                 [("Set-Cookie", f"return_to={quote(target, safe='')}; Path=/")])
+
+        if path == "/login" and self.command == "GET":
+            return self.login_page()
+
+        if path == "/session" and self.command == "POST":
+            form = self.form()
+            username = form.get("login", "")
+            if form.get("password") != PASSWORD:
+                return self.login_page('<div class="flash-error">Incorrect username or password.</div>')
+            pending = [("Set-Cookie", f"pending={username}; Path=/")]
+            if username.startswith("device"):
+                return self.redirect("https://github.com/sessions/verified-device", pending)
+            if username.startswith("totp"):
+                return self.redirect("https://github.com/sessions/two-factor/app", pending)
+            if username.startswith("mobile"):
+                return self.redirect("https://github.com/sessions/two-factor/mobile", pending)
+            return self.signed_in(username, return_to)
+
+        if path == "/sessions/verified-device":
+            username = cookies.get("pending", "")
+            with self.state.lock:
+                first = self.state.device_seen.setdefault(username, time.time())
+            if time.time() - first >= DEVICE_DELAY:
+                return self.signed_in(username, return_to)
+            return self.page("Device verification", "<h1>Device verification</h1><p>Check your email.</p>")
+
+        if path == "/sessions/two-factor/mobile":
+            with self.state.lock:
+                self.state.mobile_seen.setdefault(cookies.get("pending", ""), time.time())
+            # 和真实页面一样轮询批准状态，批准后页面自己跳走
+            return self.page("GitHub Mobile", """
+                <h1>Open GitHub Mobile</h1><div class="digit">42</div>
+                <script>
+                  setInterval(async () => {
+                    const r = await fetch('/sessions/two-factor/mobile/poll');
+                    if ((await r.json()).approved) location.href = '/sessions/two-factor/mobile/approved';
+                  }, 250);
+                </script>""")
+
+        if path == "/sessions/two-factor/mobile/poll":
+            with self.state.lock:
+                first = self.state.mobile_seen.get(cookies.get("pending", ""))
+            return self.json({"approved": first is not None and time.time() - first >= MOBILE_DELAY})
+
+        if path == "/sessions/two-factor/mobile/approved":
+            return self.signed_in(cookies.get("pending", ""), return_to)
+
+        if path == "/sessions/two-factor/app" and self.command == "GET":
+            return self.totp_page()
+
+        if path == "/sessions/two-factor" and self.command == "POST":
+            if self.form().get("app_otp") == TOTP_CODE:
+                return self.signed_in(cookies.get("pending", ""), return_to)
+            return self.totp_page('<div class="flash-error">Two-factor authentication failed.</div>')
+
+        self.reply(404, "not found")
+
+    def login_page(self, error=""):
+        self.page("Sign in to GitHub", f"""{error}
+            <form action="/session" method="post">
+              <input name="login" type="text">
+              <input name="password" type="password">
+              <input type="submit" value="Sign in">
+            </form>""")
+
+    def totp_page(self, error=""):
+        self.page("Two-factor authentication", f"""{error}
+            <form action="/sessions/two-factor" method="post">
+              <input name="app_otp" autocomplete="one-time-code" inputmode="numeric">
+              <button type="submit">Verify</button>
+            </form>""")
+
+    # ---------- Telegram ----------
+
+    def telegram(self, url):
+        method = url.path.rsplit("/", 1)[-1]
+        st = self.state
+        if method == "getUpdates":
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            offset = int(query.get("offset") or 0)
+            deadline = time.time() + min(float(query.get("timeout") or 0), 1.0)
+            while True:
+                with st.lock:
+                    now = time.time()
+                    ready = [u for at, u in st.updates if at <= now and u["update_id"] >= offset]
+                if ready or time.time() >= deadline:
+                    return self.json({"ok": True, "result": ready})
+                time.sleep(0.05)
+
+        form = self.form()
+        with st.lock:
+            st.message_id += 1
+            message_id = st.message_id
+            text = form.get("text") or ""
+            # 收到验证码提示时，稍后自动回复 /code <账号> 123456（晚于 flush_updates）
+            if method == "sendMessage" and "/code " in text and "需要验证码" in text:
+                account = text.split("<code>/code ", 1)[1].split(" ", 1)[0]
+                st.update_id += 1
+                st.updates.append((time.time() + 1.5, {
+                    "update_id": st.update_id,
+                    "message": {"chat": {"id": form.get("chat_id")}, "text": f"/code {account} {TOTP_CODE}"},
+                }))
+        self.json({"ok": True, "result": {"message_id": message_id}})
+
+
+class MockServer:
+    """在后台线程里运行的模拟服务"""
+
+    def __init__(self, port=0):
+        self.state = MockState()
+        handler = type("BoundHandler", (Handler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @property
+    def telegram_base(self):
+        return f"http://127.0.0.1:{self.port}/telegram"
+
+    async def forward(self, context, route):
+        """Playwright 路由：把浏览器的 https 请求转发到模拟服务，Cookie 手动同步"""
+        req = route.request
+        url = urlparse(req.url)
+        cookies = await context.cookies(req.url)
+        headers = {
+            "Host": url.hostname,
+            "Content-Type": req.headers.get("content-type", ""),
+            "Cookie": "; ".join(f"{c['name']}={c['value']}" for c in cookies),
+        }
+        path = url.path + (f"?{url.query}" if url.query else "")
+        status, resp_headers, body = await asyncio.to_thread(
+            self._request, req.method, path, req.post_data_buffer, headers
+        )
+
+        new_cookies = []
+        for k, v in resp_headers:
+            if k.lower() == "set-cookie":
+                for name, morsel in SimpleCookie(v).items():
+                    new_cookies.append({
+                        "name": name,
+                        "value": morsel.value,
+                        "domain": morsel["domain"] or url.hostname,
+                        "path": morsel["path"] or "/",
+                    })
+        if new_cookies:
+            await context.add_cookies(new_cookies)
+
+        await route.fulfill(
+            status=status,
+            headers={k: v for k, v in resp_headers if k.lower() not in ("set-cookie", "content-length")},
+            body=body,
+        )
+
+    def _request(self, method, path, body, headers):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=30)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            r = conn.getresponse()
+            return r.status, r.getheaders(), r.read()
+        finally:
+            conn.close()
@@ -0,0 +1,34 @@
+"""
+ClawCloud 自动登录
+- login: 单个账号的浏览器流程（AutoLogin）
+- runner: 读取账号、HTTP 快速保活、并发登录、汇总
+- telegram / github_secrets: 通知与 Secret 更新
+- daemon / scheduler / replay: 守护进程、按账号调度、离线回放
+- cli: python scripts/auto_login.py 的入口
+
+包本身不导入任何子模块，下面的名称在第一次访问时才加载对应模块，
+这样只用到调度或配置校验时不会加载 Playwright / requests / PyNaCl
+"""
+
+import importlib
+
+_EXPORTS = {
+    "AutoLogin": "login",
+    "LoginFailed": "login",
+    "Telegram": "telegram",
+    "SecretUpdater": "github_secrets",
+    "launch_options": "runner",
+    "load_accounts": "runner",
+    "make_logins": "runner",
+    "run_accounts": "runner",
+    "secret_key": "runner",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{module}", __name__), name)
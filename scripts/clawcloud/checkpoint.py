@@ -0,0 +1,77 @@
+"""
+登录流程检查点
+- 流程拆成状态：signin → github_login → device → 2fa → oauth → redirect → keepalive → persist
+- 每次状态转换后保存一次 storage state（与登录状态缓存相同的加密方式，STATE_DIR/<账号>.checkpoint）
+- 后面的步骤失败时（如两步验证通过后重定向超时），重试或下次运行从最后完成的状态继续，
+  不必再输入密码、等设备验证和两步验证
+- 认证之后失败时，本次运行内最多再从检查点重试 RESUME_ATTEMPTS 次
+- 流程成功后删除检查点；超过 CHECKPOINT_TTL 秒的检查点不再使用
+  （默认 24 小时，远大于 6 小时的定时间隔，下次运行仍能用上）
+"""
+
+import asyncio
+import os
+import time
+
+from .state_cache import StateCache
+
+CHECKPOINT_TTL = int(os.environ.get("CHECKPOINT_TTL", "86400"))  # 默认 24 小时
+RESUME_ATTEMPTS = int(os.environ.get("RESUME_ATTEMPTS", "1"))  # 本次运行内从检查点重试的次数
+
+# 状态
+SIGNIN = "signin"
+GITHUB_LOGIN = "github_login"
+DEVICE = "device"
+TWO_FACTOR = "2fa"
+OAUTH = "oauth"
+REDIRECT = "redirect"
+KEEPALIVE = "keepalive"
+PERSIST = "persist"
+DONE = "done"
+
+# 下一个状态为这些时，GitHub 已经通过认证：恢复 Cookie 后重新发起 OAuth 即可
+GITHUB_AUTHED = (OAUTH, REDIRECT)
+# 下一个状态为这些时，ClawCloud 控制台已登录：恢复 Cookie 后直接保活
+CLAW_AUTHED = (KEEPALIVE, PERSIST)
+
+
+class Checkpoints:
+    """单个账号的流程检查点"""
+
+    def __init__(self, username, secret, ttl=CHECKPOINT_TTL):
+        self.store = StateCache(username, secret, kind="checkpoint")
+        self.ttl = ttl
+        self.last = None  # {"storage_state", "region", "base_url", "state", "path", "saved_at"}
+
+    def load(self):
+        """读取未过期的检查点（进程内已有时直接使用），没有返回 None"""
+        if self.last is None:
+            data = self.store.load()
+            if data and time.time() - data.get("saved_at", 0) <= self.ttl:
+                self.last = data
+            elif data:
+                self.store.clear()
+        return self.last
+
+    def resume_at(self):
+        """可以继续的状态（GITHUB_AUTHED / CLAW_AUTHED 之一），否则返回 None"""
+        data = self.load()
+        state = data and data.get("state")
+        return state if state in GITHUB_AUTHED + CLAW_AUTHED else None
+
+    async def save(self, context, state, region, base_url, path=None):
+        """状态转换后调用：state 为接下来要执行的状态"""
+        if not self.store.ok:
+            return
+        try:
+            storage_state = await context.storage_state()
+        except Exception:
+            return
+        extra = {"state": state, "path": path}
+        self.last = {"storage_state": storage_state, "region": region, "base_url": base_url,
+                     "saved_at": int(time.time()), **extra}
+        await asyncio.to_thread(self.store.save, storage_state, region, base_url, extra)
+
+    def clear(self):
+        self.last = None
+        self.store.clear()
@@ -0,0 +1,27 @@
+"""
+命令行入口：python scripts/auto_login.py
+重量级依赖（Playwright、requests、PyNaCl）都推迟到真正用到时才导入，
+只做配置校验或只走 HTTP 保活时不会加载浏览器相关模块
+"""
+
+import asyncio
+import sys
+
+from .github_secrets import SecretUpdater
+from .runner import load_accounts, make_logins, run_accounts
+from .telegram import Telegram
+
+
+def main():
+    accounts = load_accounts()
+    if not accounts:
+        sys.exit(1)
+
+    logins = make_logins(accounts, Telegram(), SecretUpdater())
+    results = asyncio.run(run_accounts(logins))
+    if not all(r["ok"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
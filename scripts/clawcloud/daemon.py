@@ -0,0 +1,253 @@
+"""
+常驻守护进程：保持预热的 Chromium，按任务分配独立上下文
+- serve: 启动守护进程，监听本地 Unix Socket（或 --port 指定的本机 TCP 端口）
+- submit: 提交登录任务（默认全部账号，--user 指定账号），等待结果
+- status / stop: 查看状态 / 停止守护进程
+- 浏览器在处理 DAEMON_MAX_JOBS 个任务后、或进程树内存超过 DAEMON_MAX_RSS_MB 时回收重启
+
+协议：每行一个 JSON 请求，回复一行 JSON
+    {"cmd": "login", "users": ["a", "b"]}    # users 省略时为全部账号
+    {"cmd": "login", "accounts": [{"username": ..., "password": ..., "session": ...}]}
+    {"cmd": "status"} / {"cmd": "stop"}
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from .footprint import tree_rss_mb
+from .github_secrets import SecretUpdater
+from .runner import launch_options, load_accounts, make_logins, run_accounts, secret_key
+from .state_cache import STATE_DIR
+from .telegram import Telegram
+
+DAEMON_SOCKET = os.environ.get("DAEMON_SOCKET", os.path.join(STATE_DIR, "daemon.sock"))
+DAEMON_BROWSERS = int(os.environ.get("DAEMON_BROWSERS", "1"))  # 预热的浏览器数量
+DAEMON_MAX_JOBS = int(os.environ.get("DAEMON_MAX_JOBS", "50"))  # 每个浏览器最多处理的任务数
+DAEMON_MAX_RSS_MB = int(os.environ.get("DAEMON_MAX_RSS_MB", "1500"))  # 进程树内存上限
+
+
+class BrowserSlot:
+    """池中的一个浏览器"""
+
+    def __init__(self, index):
+        self.index = index
+        self.browser = None
+        self.jobs = 0  # 启动以来处理的任务数
+        self.active = 0  # 正在处理的任务数
+        self.retire = False  # 空闲后回收
+        self.launched_at = 0
+
+
+class BrowserPool:
+    """预热的浏览器池：取用负载最低的浏览器，按任务数/内存回收"""
+
+    def __init__(self, playwright, size=DAEMON_BROWSERS, max_jobs=DAEMON_MAX_JOBS, max_rss_mb=DAEMON_MAX_RSS_MB):
+        self.playwright = playwright
+        self.slots = [BrowserSlot(i) for i in range(max(1, size))]
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.recycled = 0
+        self.lock = asyncio.Lock()
+
+    async def start(self):
+        for slot in self.slots:
+            await self._launch(slot)
+
+    async def _launch(self, slot):
+        slot.browser = await self.playwright.chromium.launch(**launch_options())
+        slot.jobs = 0
+        slot.retire = False
+        slot.launched_at = time.time()
+        print(f"🌐 浏览器 #{slot.index} 已启动")
+
+    async def _recycle(self, slot, reason):
+        print(f"♻️ 回收浏览器 #{slot.index}（{reason}）")
+        try:
+            await slot.browser.close()
+        except Exception:
+            pass
+        self.recycled += 1
+        await self._launch(slot)
+
+    async def acquire(self):
+        async with self.lock:
+            candidates = [s for s in self.slots if not s.retire] or self.slots
+            slot = min(candidates, key=lambda s: s.active)
+            if not slot.browser.is_connected():
+                await self._launch(slot)
+            slot.active += 1
+            return slot
+
+    async def release(self, slot, jobs=1):
+        async with self.lock:
+            slot.active -= 1
+            slot.jobs += jobs
+            if slot.jobs >= self.max_jobs:
+                slot.retire = True
+            rss = tree_rss_mb()
+            if self.max_rss_mb and rss > self.max_rss_mb:
+                # 内存超限：回收处理任务最多的浏览器
+                max(self.slots, key=lambda s: s.jobs).retire = True
+            if slot.retire and slot.active == 0:
+                await self._recycle(slot, f"{slot.jobs} 个任务，进程树 {rss} MB")
+
+    async def close(self):
+        for slot in self.slots:
+            try:
+                await slot.browser.close()
+            except Exception:
+                pass
+
+    def status(self):
+        return {
+            "rss_mb": tree_rss_mb(),
+            "recycled": self.recycled,
+            "browsers": [
+                {"index": s.index, "jobs": s.jobs, "active": s.active,
+                 "uptime": int(time.time() - s.launched_at), "connected": s.browser.is_connected()}
+                for s in self.slots
+            ],
+        }
+
+
+class Daemon:
+    """守护进程：接收任务，用池中的浏览器登录"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.tg = Telegram()
+        self.secret = SecretUpdater()
+        self.accounts = {a["username"]: a for a in load_accounts() if a["username"]}
+        self.stopped = asyncio.Event()
+        self.served = 0
+
+    def make_logins(self, req):
+        if req.get("accounts"):
+            accounts = []
+            for a in req["accounts"]:
+                name = a.get("username") or ""
+                accounts.append({
+                    "username": name,
+                    "password": a.get("password"),
+                    "session": a.get("session", ""),
+                    "secret_name": a.get("secret_name") or f"GH_SESSION_{secret_key(name)}",
+                    "humanize": a.get("humanize"),
+                })
+        else:
+            users = req.get("users") or list(self.accounts)
+            missing = [u for u in users if u not in self.accounts]
+            if missing:
+                raise ValueError(f"未知账号: {', '.join(missing)}")
+            accounts = [self.accounts[u] for u in users]
+
+        multi = len(self.accounts) > 1 or len(accounts) > 1
+        return make_logins(accounts, self.tg, self.secret, multi)
+
+    async def login(self, req):
+        logins = self.make_logins(req)
+        slot = await self.pool.acquire()
+        try:
+            results = await run_accounts(logins, browser=slot.browser)
+        finally:
+            await self.pool.release(slot, len(logins))
+        self.served += len(logins)
+        return {"ok": all(r["ok"] for r in results), "results": results}
+
+    async def handle(self, reader, writer):
+        try:
+            line = await reader.readline()
+            req = json.loads(line or b"{}")
+            cmd = req.get("cmd")
+            if cmd == "login":
+                resp = await self.login(req)
+            elif cmd == "status":
+                resp = {"ok": True, "served": self.served, "accounts": sorted(self.accounts), **self.pool.status()}
+            elif cmd == "stop":
+                self.stopped.set()
+                resp = {"ok": True}
+            else:
+                resp = {"ok": False, "error": f"未知命令: {cmd}"}
+        except Exception as e:
+            resp = {"ok": False, "error": str(e)}
+        try:
+            writer.write((json.dumps(resp, ensure_ascii=False) + "\n").encode())
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(port=None):
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        pool = BrowserPool(p)
+        await pool.start()
+        daemon = Daemon(pool)
+
+        if port:
+            server = await asyncio.start_server(daemon.handle, "127.0.0.1", port)
+            where = f"127.0.0.1:{port}"
+        else:
+            os.makedirs(os.path.dirname(DAEMON_SOCKET) or ".", exist_ok=True)
+            if os.path.exists(DAEMON_SOCKET):
+                os.remove(DAEMON_SOCKET)
+            server = await asyncio.start_unix_server(daemon.handle, DAEMON_SOCKET)
+            os.chmod(DAEMON_SOCKET, 0o600)  # 请求里可能带密码
+            where = DAEMON_SOCKET
+
+        print(f"🚀 守护进程已启动: {where}（{len(pool.slots)} 个浏览器，{len(daemon.accounts)} 个账号）")
+        try:
+            async with server:
+                await daemon.stopped.wait()
+        finally:
+            await pool.close()
+            if not port and os.path.exists(DAEMON_SOCKET):
+                os.remove(DAEMON_SOCKET)
+        print("👋 守护进程已停止")
+
+
+async def request(req, port=None):
+    if port:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    else:
+        reader, writer = await asyncio.open_unix_connection(DAEMON_SOCKET)
+    writer.write((json.dumps(req) + "\n").encode())
+    await writer.drain()
+    line = await reader.readline()
+    writer.close()
+    return json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ClawCloud 登录守护进程")
+    parser.add_argument("cmd", choices=["serve", "submit", "status", "stop"])
+    parser.add_argument("--user", action="append", help="submit: 只登录指定账号（可重复）")
+    parser.add_argument("--port", type=int, help="使用本机 TCP 端口代替 Unix Socket")
+    args = parser.parse_args()
+
+    if args.cmd == "serve":
+        asyncio.run(serve(args.port))
+        return
+
+    req = {"cmd": "login", "users": args.user} if args.cmd == "submit" else {"cmd": args.cmd}
+    try:
+        resp = asyncio.run(request(req, args.port))
+    except OSError as e:
+        print(f"❌ 无法连接守护进程: {e}")
+        sys.exit(2)
+
+    if args.cmd == "submit" and resp.get("results"):
+        for r in resp["results"]:
+            print(f"{'✅' if r['ok'] else '❌'} {r['username']} ({r['region'] or '-'}, {r['seconds']}s) {r['error']}")
+    else:
+        print(json.dumps(resp, ensure_ascii=False, indent=2))
+    if not resp.get("ok"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
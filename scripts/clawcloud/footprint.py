@@ -0,0 +1,197 @@
+"""
+浏览器资源占用
+- BROWSER_PROFILE=lean：精简的 Chromium 启动参数（关闭 GPU、扩展、后台网络、组件更新等）和更小的视口，
+  适合内存小、需要多个上下文并排运行的机器
+- CONTEXT_MEM_MB：单个账号的 JS 堆上限。按账号页面的 CDP JSHeapTotalSize 采样（不是 RSS），
+  超过时关闭该页面，登录随即失败并关闭上下文，只影响这个账号
+- RENDERER_HEAP_MB：每个渲染进程的 V8 堆上限（--js-flags=--max-old-space-size，对整个浏览器生效）。
+  Chromium 不保证一个上下文一个渲染进程，这不是按账号的上限
+- MEASURE_MEM=1：登录期间采样进程树 RSS，结果中报告每次登录的峰值和增量，用来估算并发数
+"""
+
+import asyncio
+import os
+import statistics
+
+BROWSER_PROFILE = os.environ.get("BROWSER_PROFILE", "default").strip().lower()  # default / lean
+CONTEXT_MEM_MB = int(os.environ.get("CONTEXT_MEM_MB", "0"))  # 0 不限制
+RENDERER_HEAP_MB = int(os.environ.get("RENDERER_HEAP_MB", "0"))  # 0 不限制
+MEASURE_MEM = os.environ.get("MEASURE_MEM", "0").strip() == "1"
+MEM_SAMPLE_INTERVAL = float(os.environ.get("MEM_SAMPLE_INTERVAL", "0.5"))  # 采样间隔（秒）
+MEM_BUDGET_MB = int(os.environ.get("MEM_BUDGET_MB", "0"))  # 机器可用内存，测量模式下据此估算并发数
+
+# 登录流程用不到的子系统：GPU、扩展、后台网络、组件更新、同步、翻译等
+LEAN_ARGS = [
+    '--disable-gpu',
+    '--disable-software-rasterizer',
+    '--disable-extensions',
+    '--disable-component-extensions-with-background-pages',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-breakpad',
+    '--disable-client-side-phishing-detection',
+    '--disable-domain-reliability',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,InterestFeedContentSuggestions',
+    '--disable-dev-shm-usage',
+    '--metrics-recording-only',
+    '--mute-audio',
+    '--no-default-browser-check',
+    '--no-first-run',
+]
+
+FULL_VIEWPORT = {'width': 1920, 'height': 1080}
+LEAN_VIEWPORT = {'width': 1280, 'height': 720}  # 截图本来就缩小到 SHOT_MAX_WIDTH（默认 1280）
+BARE_VIEWPORT = {'width': 800, 'height': 600}  # 不需要截图时
+
+
+def launch_args(profile=BROWSER_PROFILE, heap_mb=RENDERER_HEAP_MB):
+    """按配置追加的 Chromium 启动参数"""
+    args = list(LEAN_ARGS) if profile == "lean" else []
+    if heap_mb:
+        # 限制的是每个渲染进程的 V8 老生代，多个上下文可能共用一个渲染进程
+        args.append(f'--js-flags=--max-old-space-size={heap_mb}')
+    return args
+
+
+def viewport(shots=True, profile=BROWSER_PROFILE):
+    """上下文视口：lean 时缩小，不需要截图时更小"""
+    if profile != "lean":
+        return dict(FULL_VIEWPORT)
+    return dict(LEAN_VIEWPORT if shots else BARE_VIEWPORT)
+
+
+def tree_rss_mb(root=None):
+    """当前进程及所有子进程（Playwright 驱动、Chromium）的 RSS 总和，非 Linux 返回 0"""
+    root = root or os.getpid()
+    try:
+        parents = {}
+        for pid in os.listdir("/proc"):
+            if not pid.isdigit():
+                continue
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    # 第 2 个字段 (comm) 可能含空格，从最后一个 ')' 之后解析
+                    fields = f.read().rsplit(")", 1)[1].split()
+                parents[int(pid)] = int(fields[1])
+            except (OSError, IndexError, ValueError):
+                continue
+
+        tree, frontier = {root}, [root]
+        while frontier:
+            cur = frontier.pop()
+            for pid, ppid in parents.items():
+                if ppid == cur and pid not in tree:
+                    tree.add(pid)
+                    frontier.append(pid)
+
+        total_kb = 0
+        for pid in tree:
+            try:
+                with open(f"/proc/{pid}/status") as f:
+                    for line in f:
+                        if line.startswith("VmRSS:"):
+                            total_kb += int(line.split()[1])
+                            break
+            except (OSError, ValueError):
+                continue
+        return total_kb // 1024
+    except OSError:
+        return 0
+
+
+class MemoryMeter:
+    """
+    单次登录的内存采样
+    - 账号页面的 JS 堆（CDP Performance.getMetrics 的 JSHeapTotalSize，不含 DOM、图片等）：
+      超过 cap_mb 时关闭页面，登录随即失败，上下文由调用方关闭
+    - 进程树 RSS（仅 measure 时）：峰值和相对开始时的增量
+      并发登录时 RSS 是所有账号共享的，增量更接近单个上下文的真实开销
+    """
+
+    def __init__(self, page, cap_mb=CONTEXT_MEM_MB, measure=MEASURE_MEM, interval=MEM_SAMPLE_INTERVAL):
+        self.page = page
+        self.cap_mb = cap_mb
+        self.measure = measure
+        self.interval = interval
+        self.enabled = bool(cap_mb or measure)
+        self.cdp = None
+        self.task = None
+        self.base_rss = 0
+        self.peak_rss = 0
+        self.peak_heap = 0.0
+        self.exceeded = None  # 超过上限时的 JS 堆大小（MB）
+
+    async def start(self):
+        if not self.enabled:
+            return
+        try:
+            self.cdp = await self.page.context.new_cdp_session(self.page)
+            await self.cdp.send("Performance.enable")
+        except Exception:
+            self.cdp = None
+        if self.measure:
+            self.base_rss = self.peak_rss = await asyncio.to_thread(tree_rss_mb)
+        self.task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        while self.exceeded is None:
+            await self.sample()
+            await asyncio.sleep(self.interval)
+
+    async def sample(self):
+        if self.cdp:
+            try:
+                metrics = await self.cdp.send("Performance.getMetrics")
+                heap = next(m["value"] for m in metrics["metrics"] if m["name"] == "JSHeapTotalSize")
+                self.peak_heap = max(self.peak_heap, heap / 1048576)
+            except Exception:
+                pass
+        if self.measure:
+            self.peak_rss = max(self.peak_rss, await asyncio.to_thread(tree_rss_mb))
+        if self.cap_mb and self.peak_heap > self.cap_mb and self.exceeded is None:
+            self.exceeded = round(self.peak_heap)
+            try:
+                await self.page.close()
+            except Exception:
+                pass
+
+    def error(self):
+        """超过上限时的错误说明，否则为空"""
+        if self.exceeded is None:
+            return ""
+        return f"页面 JS 堆 {self.exceeded} MB 超过上限 {self.cap_mb} MB"
+
+    async def stop(self):
+        """在关闭上下文之前调用，返回采样结果（未启用返回 None）"""
+        if not self.enabled:
+            return None
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+        if self.exceeded is None:
+            await self.sample()
+        stats = {"peak_heap_mb": round(self.peak_heap, 1)}
+        if self.measure:
+            stats["base_rss_mb"] = self.base_rss
+            stats["peak_rss_mb"] = self.peak_rss
+            stats["rss_delta_mb"] = max(0, self.peak_rss - self.base_rss)
+        return stats
+
+
+def report(results, budget_mb=MEM_BUDGET_MB):
+    """测量模式的汇总：每次登录的 RSS 增量，配置了 MEM_BUDGET_MB 时估算可用的并发数"""
+    mems = [r["mem"] for r in results if (r.get("mem") or {}).get("peak_rss_mb")]
+    if not mems:
+        return ""
+    deltas = sorted(m["rss_delta_mb"] for m in mems)
+    base = min(m["base_rss_mb"] for m in mems)
+    lines = [
+        f"📏 内存（{BROWSER_PROFILE}）: 进程树峰值 {max(m['peak_rss_mb'] for m in mems)} MB，"
+        f"浏览器基线 {base} MB，单次登录增量 中位 {statistics.median(deltas):.0f} MB / 最大 {deltas[-1]} MB",
+    ]
+    if budget_mb and deltas[-1]:
+        fit = max(1, (budget_mb - base) // deltas[-1])
+        lines.append(f"📏 按最大增量估算，{budget_mb} MB 内可同时运行约 {fit} 个上下文（CONCURRENCY）")
+    return "\n".join(lines)
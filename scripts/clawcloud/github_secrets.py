@@ -0,0 +1,172 @@
+"""
+GitHub Secrets 更新
+- 登录成功后把新的 GH_SESSION 写回仓库 Secret
+- 多账号的 GH_SESSION_<用户名> 合并写入一个 GH_SESSIONS Secret（JSON），
+  工作流只需传这一个 Secret，不必把全部 Secret 交给脚本
+- 无法自动更新时通过 Telegram 发送 Cookie
+- requests / PyNaCl 只在真正写入 Secret 时才导入
+"""
+
+import base64
+import hashlib
+import json
+import os
+
+from .retry import Breaker, retry_sync
+from .state_cache import STATE_DIR
+
+SESSIONS_SECRET = "GH_SESSIONS"  # 多账号 Cookie：{"GH_SESSION_<用户名>": "..."}
+
+
+class SecretUpdater:
+    """
+    GitHub Secret 更新器
+    - 进程内缓存仓库公钥和 key_id，返回 422（公钥已轮换）时才重新获取
+    - 复用一个 HTTP 连接
+    - 记录每个 Secret 上次写入值的哈希，值没变就不再写
+    - stage() 先登记，flush() 一次性写入所有账号的 Secret
+    """
+
+    def __init__(self):
+        self.token = os.environ.get('REPO_TOKEN')
+        self.repo = os.environ.get('GITHUB_REPOSITORY')
+        self.ok = bool(self.token and self.repo)
+        self.api = f"https://api.github.com/repos/{self.repo}/actions/secrets"
+        self._session = None  # 第一次写入时才创建
+        self.key = None  # (PublicKey, key_id)
+        self.pending = {}  # name -> value
+        try:
+            self.sessions = json.loads(os.environ.get(SESSIONS_SECRET) or '{}')  # 合并写入 GH_SESSIONS 的内容
+        except ValueError:
+            self.sessions = {}
+        self.breaker = Breaker.get("api.github.com")
+        self.hash_file = os.path.join(STATE_DIR, "secrets.json")
+        self.hashes = self._load_hashes()
+        if self.ok:
+            print("✅ Secret 自动更新已启用")
+        else:
+            print("⚠️ Secret 自动更新未启用（需要 REPO_TOKEN）")
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+            self._session.headers.update({
+                "Authorization": f"token {self.token}",
+                "Accept": "application/vnd.github.v3+json"
+            })
+        return self._session
+
+    def _load_hashes(self):
+        try:
+            with open(self.hash_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_hashes(self):
+        try:
+            os.makedirs(STATE_DIR, exist_ok=True)
+            with open(self.hash_file, 'w') as f:
+                json.dump(self.hashes, f)
+        except OSError as e:
+            print(f"保存 Secret 哈希失败: {e}")
+
+    @staticmethod
+    def digest(name, value):
+        return hashlib.sha256(f"{name}\0{value}".encode()).hexdigest()
+
+    def public_key(self, refresh=False):
+        """获取（并缓存）仓库公钥"""
+        if self.key and not refresh:
+            return self.key
+        from nacl import encoding, public
+
+        r = retry_sync(lambda: self.session.get(f"{self.api}/public-key", timeout=30), self.breaker)
+        if r.status_code != 200:
+            return None
+        key_data = r.json()
+        pk = public.PublicKey(key_data['key'].encode(), encoding.Base64Encoder())
+        self.key = (pk, key_data['key_id'])
+        return self.key
+
+    def _put(self, name, value, refresh=False):
+        from nacl import public
+
+        key = self.public_key(refresh)
+        if not key:
+            return None
+        pk, key_id = key
+        encrypted = public.SealedBox(pk).encrypt(value.encode())
+        return retry_sync(lambda: self.session.put(
+            f"{self.api}/{name}",
+            json={"encrypted_value": base64.b64encode(encrypted).decode(), "key_id": key_id},
+            timeout=30
+        ), self.breaker)
+
+    def update(self, name, value):
+        """写入一个 Secret，返回 "updated" / "unchanged" / "failed"（未启用返回 None）"""
+        if not self.ok:
+            return None
+        h = self.digest(name, value)
+        if self.hashes.get(name) == h:
+            return "unchanged"
+        try:
+            r = self._put(name, value)
+            if r is not None and r.status_code == 422:
+                # key_id 过期，刷新公钥后重试一次
+                r = self._put(name, value, refresh=True)
+            if r is None or r.status_code not in [201, 204]:
+                return "failed"
+            self.hashes[name] = h
+            return "updated"
+        except Exception as e:
+            print(f"更新 Secret 失败: {e}")
+            return "failed"
+
+    def stage(self, name, value):
+        """登记待写入的 Secret，flush() 时统一写入；GH_SESSION_<用户名> 合并进 GH_SESSIONS"""
+        if name.startswith("GH_SESSION_"):
+            self.sessions[name] = value
+            name, value = SESSIONS_SECRET, json.dumps(self.sessions, sort_keys=True)
+        self.pending[name] = value
+
+    def flush(self):
+        """写入所有登记的 Secret，返回 {name: 状态}"""
+        results = {}
+        pending, self.pending = self.pending, {}
+        for name, value in pending.items():
+            results[name] = self.update(name, value)
+        if any(st == "updated" for st in results.values()):
+            self._save_hashes()
+        return results
+
+
+
+def send_cookie(tg, name, value):
+    """无法自动更新时，通过 Telegram 发送 Cookie 让用户手动更新"""
+    tg.send(f"""🔑 <b>新 Cookie</b>
+
+请更新 Secret <b>{name}</b> (点击查看):
+<tg-spoiler>{value}</tg-spoiler>
+""")
+
+
+def save_secrets(secret, tg):
+    """一次性写入本次运行登记的所有 Secret，失败的改为通过 Telegram 发送"""
+    if not secret.pending:
+        return
+    values = dict(secret.pending)
+    results = secret.flush()
+    updated = [n for n, st in results.items() if st == "updated"]
+    unchanged = [n for n, st in results.items() if st == "unchanged"]
+    failed = [n for n, st in results.items() if st == "failed"]
+
+    print(f"🔑 Secret: 更新 {len(updated)}，未变化 {len(unchanged)}，失败 {len(failed)}")
+    if updated:
+        tg.send("🔑 <b>Cookie 已自动更新</b>\n\n" + "\n".join(f"{n} 已保存" for n in updated))
+    for n in failed:
+        send_cookie(tg, n, values[n])
+
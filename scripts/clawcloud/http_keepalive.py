@@ -0,0 +1,125 @@
+"""
+HTTP 快速保活
+- 不启动 Chromium，用缓存的 claw.cloud Cookie 直接请求区域控制台
+- 已登录需要正面的信号：没有跳回 signin、页面里没有登录入口；
+  配置了 CLAW_AUTH_API 时还要求该接口返回 JSON（控制台在前端判断登录状态时，未登录也是 200）
+- 无效时由调用方回退到完整的浏览器流程
+"""
+
+import os
+from urllib.parse import urlparse
+
+from .proxy_pool import proxy_name
+from .retry import Breaker, CircuitOpen, host_key, retry_sync
+
+# 未登录时会被重定向到这些路径
+SIGNIN_MARKERS = ('/signin', '/login')
+# 页面里出现这些内容说明是登录页（小写匹配，只看前 64KB）
+SIGNIN_PAGE_MARKERS = ('continue with github', 'sign in with github', '/login/signin', 'type="password"')
+# 只有登录后才返回 JSON 的控制台接口路径（如 /api/...），留空时只看页面
+CLAW_AUTH_API = os.environ.get("CLAW_AUTH_API", "").strip()
+
+
+def claw_cookies(storage_state):
+    """从 storage state 里取出 claw.cloud 的 Cookie"""
+    return [
+        c for c in (storage_state or {}).get("cookies", [])
+        if c.get("domain", "").lstrip(".").endswith("claw.cloud")
+    ]
+
+
+def merge_cookies(storage_state, jar):
+    """把响应里更新过的 Cookie 写回 storage state，保存后下次继续使用"""
+    fresh = {(c.domain.lstrip("."), c.path, c.name): c.value for c in jar}
+    for c in storage_state.get("cookies", []):
+        key = (c.get("domain", "").lstrip("."), c.get("path", "/"), c.get("name"))
+        if key in fresh:
+            c["value"] = fresh[key]
+    return storage_state
+
+
+def signed_in_page(status, url, body):
+    """控制台页面的响应是否来自已登录状态：200、claw.cloud、没被重定向回 signin、页面不是登录页"""
+    if status != 200:
+        return False
+    u = urlparse(url)
+    if not (u.hostname or "").endswith("claw.cloud"):
+        return False
+    if any(m in u.path.lower() for m in SIGNIN_MARKERS):
+        return False
+    text = body[:65536].decode("utf-8", "ignore").lower()
+    return not any(m in text for m in SIGNIN_PAGE_MARKERS)
+
+
+def api_authenticated(session, base_url, timeout):
+    """配置了 CLAW_AUTH_API 时，该接口返回 200 且是 JSON 才算已登录；未配置返回 True"""
+    if not CLAW_AUTH_API:
+        return True
+    r = session.get(f"{base_url}{CLAW_AUTH_API}", timeout=timeout, allow_redirects=False,
+                    headers={"Accept": "application/json"})
+    if r.status_code != 200 or "json" not in r.headers.get("Content-Type", ""):
+        return False
+    try:
+        r.json()
+    except ValueError:
+        return False
+    return True
+
+
+class HttpKeepalive:
+    """用 requests 访问区域控制台的保活页面"""
+
+    def __init__(self, storage_state, base_url, user_agent, proxy="", timeout=15):
+        import requests
+
+        self.storage_state = storage_state
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        self.via = proxy_name(proxy) if proxy else ""  # 熔断器按 (代理, 主机) 区分
+        if proxy:
+            self.session.proxies = {"http": proxy, "https": proxy}
+        self.cookies = claw_cookies(storage_state)
+        for c in self.cookies:
+            self.session.cookies.set(c["name"], c["value"], domain=c["domain"], path=c.get("path", "/"))
+
+    def authenticated(self, r):
+        """响应是否来自已登录的控制台"""
+        return signed_in_page(r.status_code, r.url, r.content)
+
+    def run(self):
+        """
+        依次访问控制台和应用页
+        返回 (是否成功, 最后的 URL 或错误信息)，网络错误时“是否成功”为 None（Cookie 状态未知）
+        """
+        import requests
+
+        if not self.cookies:
+            return False, "缓存中没有 claw.cloud Cookie"
+
+        last_url = ""
+        breaker = Breaker.get(host_key(self.base_url, self.via))
+        try:
+            for path in ("/", "/apps"):
+                r = retry_sync(
+                    lambda: self.session.get(f"{self.base_url}{path}", timeout=self.timeout, allow_redirects=True),
+                    breaker,
+                    attempts=2,
+                )
+                last_url = r.url
+                if not self.authenticated(r):
+                    return False, f"未登录 ({r.status_code} {r.url})"
+            if not retry_sync(lambda: api_authenticated(self.session, self.base_url, self.timeout), breaker, attempts=2):
+                return False, f"未登录 ({CLAW_AUTH_API} 没有返回 JSON)"
+        except (requests.RequestException, CircuitOpen) as e:
+            return None, str(e)
+        finally:
+            self.session.close()
+
+        merge_cookies(self.storage_state, self.session.cookies)
+        return True, last_url
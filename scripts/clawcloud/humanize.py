@@ -0,0 +1,75 @@
+"""
+模拟人工操作的延迟策略
+- 每次运行有总的延迟预算（HUMANIZE_BUDGET 秒），用完后不再额外停顿
+- 敏感操作（输入账号密码、验证码，点击授权）可以用完整预算；其它操作最多用 LOOSE_SHARE 的比例，保证敏感操作有余量
+- 配置：normal 正常延迟；fast 只给敏感操作留少量延迟；off 不延迟；auto 按登录路径选择（Cookie 有效时 fast）
+- 每段延迟计入时间线的 delay_ms，配置和用量写入时间线末尾
+"""
+
+import asyncio
+import os
+import random
+
+HUMANIZE = os.environ.get("HUMANIZE", "auto").strip().lower() or "auto"
+HUMANIZE_BUDGET = float(os.environ.get("HUMANIZE_BUDGET", "8"))
+LOOSE_SHARE = 0.3  # 非敏感操作最多使用的预算比例
+
+# 配置 -> (敏感操作的延迟倍数, 其它操作的延迟倍数)
+PROFILES = {
+    "normal": (1.0, 1.0),
+    "fast": (0.3, 0.0),
+    "off": (0.0, 0.0),
+}
+
+
+class Humanizer:
+    """单个账号一次运行的延迟预算"""
+
+    def __init__(self, profile=None, budget=None, timeline=None):
+        self.requested = (profile or HUMANIZE).lower()
+        self.profile = self.requested if self.requested in PROFILES else "normal"
+        self.budget = HUMANIZE_BUDGET if budget is None else budget
+        self.timeline = timeline
+        self.spent = 0.0
+        self.loose_spent = 0.0
+        self.record()
+
+    def choose(self, fast):
+        """auto 配置下按登录路径选择：不需要输入凭据的路径用 fast"""
+        if self.requested == "auto":
+            self.profile = "fast" if fast else "normal"
+            self.record()
+
+    def take(self, seconds, sensitive=False):
+        """按配置缩放并从预算中扣除，返回实际可用的秒数"""
+        seconds *= PROFILES[self.profile][0 if sensitive else 1]
+        limit = self.budget - self.spent
+        if not sensitive:
+            limit = min(limit, self.budget * LOOSE_SHARE - self.loose_spent)
+        seconds = max(0.0, min(seconds, limit))
+        self.spent += seconds
+        if not sensitive:
+            self.loose_spent += seconds
+        if self.timeline and seconds:
+            self.timeline.count("delay_ms", int(seconds * 1000))
+            self.record()
+        return seconds
+
+    async def pause(self, lo, hi, sensitive=False):
+        seconds = self.take(random.uniform(lo, hi), sensitive)
+        if seconds:
+            await asyncio.sleep(seconds)
+
+    def key_delay(self, text, lo, hi, sensitive=True):
+        """逐字输入时每个按键的间隔（毫秒），整段输入一起计入预算"""
+        n = max(1, len(text or ""))
+        per_key = random.randint(lo, hi) / 1000
+        return int(self.take(per_key * n, sensitive) / n * 1000)
+
+    def record(self):
+        if self.timeline:
+            self.timeline.meta["humanize"] = {
+                "profile": self.profile,
+                "budget": self.budget,
+                "spent": round(self.spent, 2),
+            }
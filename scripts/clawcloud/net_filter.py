@@ -0,0 +1,111 @@
+"""
+网络请求过滤
+- 在浏览器上下文上拦截登录流程用不到的资源（图片、字体、媒体）和统计/埋点请求
+- 白名单里的 URL（验证码、登录页面本身）永远放行
+- 记录每次运行拦截的请求数和估算节省的流量
+- 放行的请求用 route.fallback() 交给后注册的路由（如本地模拟、HAR 回放），没有则正常发出
+"""
+
+import os
+import re
+
+# 默认拦截的资源类型，样式表保留（元素可见性判断依赖 CSS）
+DEFAULT_BLOCK_TYPES = "image,media,font"
+
+# 统计、埋点、错误上报，直接返回 204
+DEFAULT_BLOCK_URLS = [
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"hotjar\.com",
+    r"sentry\.io",
+    r"segment\.(io|com)",
+    r"clarity\.ms",
+    r"collector\.github\.com",
+    r"api\.github\.com/_private/browser/(stats|errors)",
+]
+
+# 永远放行：人机验证、GitHub 登录相关页面
+DEFAULT_ALLOW_URLS = [
+    r"octocaptcha\.com",
+    r"arkoselabs\.com",
+    r"funcaptcha\.com",
+    r"hcaptcha\.com",
+    r"recaptcha",
+]
+
+# 被拦截资源的典型大小（字节），用于估算节省的流量
+TYPICAL_SIZE = {
+    "image": 30 * 1024,
+    "media": 500 * 1024,
+    "font": 40 * 1024,
+    "tracker": 5 * 1024,
+}
+
+
+def split_env(name, default=""):
+    return [x.strip() for x in os.environ.get(name, default).split(",") if x.strip()]
+
+
+class RequestFilter:
+    """单个浏览器上下文的请求过滤器"""
+
+    def __init__(self, block_types=None, block_urls=None, allow_urls=None):
+        self.enabled = os.environ.get("NET_FILTER", "1").strip() != "0"
+        if block_types is None:
+            block_types = split_env("BLOCK_RESOURCES", DEFAULT_BLOCK_TYPES)
+        if block_urls is None:
+            block_urls = DEFAULT_BLOCK_URLS + split_env("BLOCK_URLS")
+        if allow_urls is None:
+            allow_urls = DEFAULT_ALLOW_URLS + split_env("ALLOW_URLS")
+        self.block_types = set(block_types)
+        self.block_urls = [re.compile(p) for p in block_urls]
+        self.allow_urls = [re.compile(p) for p in allow_urls]
+
+        self.blocked = {}  # 类型 -> 拦截次数
+        self.passed = 0
+
+    async def install(self, context):
+        if self.enabled:
+            await context.route("**/*", self.handle)
+
+    def allowed(self, url):
+        return any(p.search(url) for p in self.allow_urls)
+
+    async def handle(self, route):
+        req = route.request
+        url = req.url
+        try:
+            if req.resource_type == "document" or self.allowed(url):
+                self.passed += 1
+                await route.fallback()
+            elif req.resource_type in self.block_types:
+                self.blocked[req.resource_type] = self.blocked.get(req.resource_type, 0) + 1
+                await route.abort("blockedbyclient")
+            elif any(p.search(url) for p in self.block_urls):
+                # 返回空响应而不是中断，避免页面脚本报错重试
+                self.blocked["tracker"] = self.blocked.get("tracker", 0) + 1
+                await route.fulfill(status=204, body="")
+            else:
+                self.passed += 1
+                await route.fallback()
+        except Exception:
+            # 页面已关闭等情况，忽略
+            pass
+
+    def stats(self):
+        count = sum(self.blocked.values())
+        saved = sum(TYPICAL_SIZE.get(t, 0) * n for t, n in self.blocked.items())
+        return {
+            "blocked": count,
+            "passed": self.passed,
+            "saved_kb": round(saved / 1024),
+            "by_type": dict(self.blocked),
+        }
+
+    def summary(self):
+        st = self.stats()
+        if not self.enabled:
+            return "请求过滤未启用"
+        detail = ", ".join(f"{t} {n}" for t, n in st["by_type"].items()) or "无"
+        return f"拦截 {st['blocked']} 个请求（{detail}），约节省 {st['saved_kb']} KB"
@@ -0,0 +1,194 @@
+"""
+页面就绪信号
+- 取代 wait_for_load_state('networkidle')：长轮询、统计埋点会让页面一直不空闲，等满超时才返回
+- 每种页面定义自己的“就绪”：先到某个加载阶段，再等某个元素出现或某个接口返回（任一即可）
+- 按当前 URL 选择页面定义；等待期间又跳转了（重定向链），按新 URL 重新选择
+- 控制台以接口返回为准：READY_CONSOLE_API（正则，默认 /api/）匹配的请求成功返回即视为应用列表已加载
+"""
+
+import asyncio
+import os
+import re
+from urllib.parse import urlparse
+
+from .waits import wait_url
+
+READY_CONSOLE_API = os.environ.get("READY_CONSOLE_API", r"/api/").strip()
+
+
+class Readiness:
+    """一种页面的就绪定义"""
+
+    def __init__(self, name, match, load="domcontentloaded", selector=None, response=None):
+        self.name = name
+        self.match = match  # url -> bool
+        self.load = load  # 先等到的加载阶段
+        self.selector = selector  # 出现即就绪
+        self.response = re.compile(response) if response else None  # 匹配的响应成功返回即就绪
+
+
+def _host(url):
+    return urlparse(url).hostname or ""
+
+
+def _claw_signin(url):
+    return _host(url).endswith("claw.cloud") and ("signin" in url.lower() or urlparse(url).path.startswith("/login"))
+
+
+def _claw_console(url):
+    return _host(url).endswith("claw.cloud") and not _claw_signin(url)
+
+
+def _github(url, *parts):
+    return _host(url) == "github.com" and any(p in url for p in parts)
+
+
+# 按顺序匹配，先匹配先用
+PAGES = [
+    Readiness("ClawCloud 登录页", _claw_signin,
+              selector='button:has-text("GitHub"), a:has-text("GitHub"), [data-provider="github"]'),
+    Readiness("ClawCloud 控制台", _claw_console, load="load", response=READY_CONSOLE_API or None),
+    Readiness("GitHub 授权", lambda url: _github(url, "/login/oauth/authorize"),
+              selector='button[name="authorize"], button:has-text("Authorize")'),
+    # GitHub Mobile 页面上的数字由脚本渲染，没有稳定的元素可等
+    Readiness("GitHub Mobile", lambda url: _github(url, "two-factor/mobile"), load="load"),
+    Readiness("GitHub 两步验证", lambda url: _github(url, "two-factor"),
+              selector='input[name="app_otp"], input[name="otp"], input#app_totp, input#otp, '
+                       'input[autocomplete="one-time-code"], button:has-text("More options")'),
+    Readiness("GitHub 设备验证", lambda url: _github(url, "verified-device", "device-verification"), load="load"),
+    Readiness("GitHub 登录", lambda url: _github(url, "/login", "/session"),
+              selector='input[name="password"], .flash-error'),
+]
+DEFAULT = Readiness("页面", lambda url: True, load="load")
+
+
+def readiness_for(url, pages=PAGES):
+    return next((p for p in pages if p.match(url)), DEFAULT)
+
+
+def _true(task):
+    return task.done() and not task.cancelled() and not task.exception() and bool(task.result())
+
+
+async def first_true(aws, timeout):
+    """并发等待多个协程，任一返回真值即返回 True；全部失败或超时返回 False"""
+    tasks = {asyncio.ensure_future(a) for a in aws}
+    try:
+        pending = tasks
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=max(0, deadline - loop.time()),
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                return False
+            if any(_true(t) for t in done):
+                return True
+        return False
+    finally:
+        for t in tasks:
+            if not t.done():
+                t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class PageReadiness:
+    """
+    跟踪一个页面的导航和响应，按页面定义等待就绪
+    在第一次导航之前创建，这样等待开始前就已返回的接口也能算上
+    """
+
+    def __init__(self, page, pages=PAGES):
+        self.page = page
+        self.pages = pages
+        self.responses = []  # 当前文档加载以来成功返回的响应 URL
+        self.document = None  # (主机, 路径)，变化时清空 responses
+        self.changed = asyncio.Event()
+        page.on("response", self._on_response)
+        page.on("framenavigated", self._on_navigated)
+
+    def _on_response(self, response):
+        try:
+            if response.status < 400:
+                self.responses.append(response.url)
+                self.changed.set()
+        except Exception:
+            pass
+
+    def _on_navigated(self, frame):
+        # 只在换了页面时清空，避免上一个页面的接口响应让下一个页面提前“就绪”
+        if frame != self.page.main_frame:
+            return
+        u = urlparse(frame.url)
+        if (u.hostname, u.path) != self.document:
+            self.document = (u.hostname, u.path)
+            self.responses = []
+
+    async def _response(self, pattern, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        seen = 0
+        while True:
+            if any(pattern.search(u) for u in self.responses[seen:]):
+                return True
+            seen = len(self.responses)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            self.changed.clear()
+            try:
+                await asyncio.wait_for(self.changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+
+    async def _selector(self, selector, timeout):
+        await self.page.locator(selector).first.wait_for(state="visible", timeout=timeout * 1000)
+        return True
+
+    async def _ready(self, spec, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            await self.page.wait_for_load_state(spec.load, timeout=timeout * 1000)
+        except Exception:
+            return False
+        signals = []
+        if spec.selector:
+            signals.append(self._selector(spec.selector, max(0.001, deadline - loop.time())))
+        if spec.response:
+            signals.append(self._response(spec.response, max(0.001, deadline - loop.time())))
+        if not signals:
+            return True
+        return await first_true(signals, max(0, deadline - loop.time()))
+
+    async def wait(self, timeout):
+        """
+        等当前页面就绪（timeout 毫秒），返回就绪页面的名称；超时返回 None
+        等待期间页面跳转时，按新 URL 重新选择页面定义
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout / 1000
+        while (remaining := deadline - loop.time()) > 0:
+            url = self.page.url
+            spec = readiness_for(url, self.pages)
+            ready = asyncio.ensure_future(self._ready(spec, remaining))
+            moved = asyncio.ensure_future(wait_url(self.page, lambda u: u != url, remaining * 1000))
+            try:
+                done, _ = await asyncio.wait({ready, moved}, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                if moved in done and ready not in done and not _true(moved):
+                    # 等跳转出错了，只等就绪信号
+                    done, _ = await asyncio.wait({ready}, timeout=max(0, deadline - loop.time()))
+                if ready in done and _true(ready):
+                    return spec.name
+                if ready in done and moved not in done:
+                    # 没等到信号（例如加载被新的导航打断），看页面是否还会跳转
+                    await asyncio.wait({moved}, timeout=max(0, deadline - loop.time()))
+                if _true(moved):
+                    continue
+                return None
+            finally:
+                for t in (ready, moved):
+                    if not t.done():
+                        t.cancel()
+                await asyncio.gather(ready, moved, return_exceptions=True)
+        return None
@@ -0,0 +1,77 @@
+"""
+运行录制
+- RECORD=1 时为每个账号录制 Playwright trace 和 HAR（RECORD=fail 只保留失败的运行）
+- 文件写入 RECORD_DIR（默认 records/）：<账号>-<run_id>.trace.zip / .har.zip / .json
+- trace 用 `playwright show-trace` 查看；HAR 可用 scripts/replay.py 离线回放
+- 注意：HAR 和 trace 里有密码、Cookie 等敏感信息，不要上传到公开位置
+"""
+
+import json
+import os
+import re
+
+RECORD = os.environ.get("RECORD", "0").strip().lower()  # 0 / 1 / fail
+RECORD_DIR = os.environ.get("RECORD_DIR", "records").strip() or "records"
+
+
+class Recorder:
+    """单个账号一次运行的 trace + HAR 录制"""
+
+    def __init__(self, username, run_id, mode=RECORD, directory=RECORD_DIR):
+        self.mode = mode
+        self.enabled = mode not in ("", "0", "off", "false")
+        self.directory = directory
+        name = re.sub(r'[^A-Za-z0-9_.-]', '_', username or "unknown")
+        self.base = os.path.join(directory, f"{name}-{run_id}")
+        self.attempt = 0  # 代理切换后重新开始时用新文件
+        self.files = []
+
+    def prefix(self):
+        return self.base if self.attempt <= 1 else f"{self.base}-{self.attempt}"
+
+    def context_args(self):
+        """new_context 的 HAR 参数；.zip 后缀会把响应内容一起打包，供 route_from_har 回放"""
+        if not self.enabled:
+            return {}
+        os.makedirs(self.directory, exist_ok=True)
+        self.attempt += 1
+        har = f"{self.prefix()}.har.zip"
+        self.files.append(har)
+        return {"record_har_path": har, "record_har_mode": "full"}
+
+    async def start(self, context):
+        if not self.enabled:
+            return
+        try:
+            await context.tracing.start(screenshots=True, snapshots=True)
+        except Exception as e:
+            print(f"开始 trace 录制失败: {e}")
+
+    async def stop(self, context, meta):
+        """在 context.close() 之前调用：保存 trace 和运行信息（HAR 在关闭上下文时写入）"""
+        if not self.enabled:
+            return
+        trace = f"{self.prefix()}.trace.zip"
+        try:
+            await context.tracing.stop(path=trace)
+            self.files.append(trace)
+        except Exception as e:
+            print(f"保存 trace 失败: {e}")
+        info = f"{self.prefix()}.json"
+        try:
+            with open(info, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+            self.files.append(info)
+        except OSError as e:
+            print(f"保存录制信息失败: {e}")
+
+    def finish(self, ok):
+        """运行结束：RECORD=fail 时删除成功运行的录制，返回保留的文件"""
+        if self.enabled and ok and self.mode == "fail":
+            for path in self.files:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.files = []
+        return [p for p in self.files if os.path.exists(p)]
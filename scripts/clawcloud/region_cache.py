@@ -0,0 +1,66 @@
+"""
+区域缓存
+- 按用户名记录检测到的区域和区域控制台地址（STATE_DIR/regions.json，不含敏感信息，不加密）
+- 下次运行直接打开区域控制台，跳过入口域名的重定向链
+- 跳转后发现区域变化时由调用方覆盖写入，控制台打不开时删除
+"""
+
+import json
+import os
+import threading
+import time
+
+from .state_cache import STATE_DIR
+
+REGION_FILE = os.path.join(STATE_DIR, "regions.json")
+
+
+class RegionCache:
+    """账号 -> {"region", "base_url", "at"}"""
+
+    lock = threading.Lock()
+
+    def __init__(self, path=REGION_FILE):
+        self.path = path
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"保存区域缓存失败: {e}")
+
+    def get(self, username):
+        """返回 (区域, 基础 URL)，没有记录返回 (None, None)"""
+        with self.lock:
+            e = self._read().get(username or "")
+        if not e or not e.get("base_url"):
+            return None, None
+        return e.get("region"), e["base_url"]
+
+    def put(self, username, region, base_url):
+        if not username or not base_url:
+            return
+        with self.lock:
+            data = self._read()
+            old = data.get(username, {})
+            if old.get("region") == region and old.get("base_url") == base_url:
+                return
+            data[username] = {"region": region, "base_url": base_url, "at": int(time.time())}
+            self._write(data)
+
+    def forget(self, username):
+        with self.lock:
+            data = self._read()
+            if data.pop(username or "", None) is not None:
+                self._write(data)
@@ -0,0 +1,177 @@
+"""
+离线回放录制的运行（RECORD=1 生成的 HAR）
+- 用 route_from_har 提供所有响应，不访问 github.com / claw.cloud / Telegram
+- 密码和两步验证码从 HAR 里的表单提交中取出（POST 必须与录制时完全一致才能匹配）
+- 用于改了选择器或流程后快速检查，几秒内跑完
+
+用法:
+    python scripts/replay.py records/alice-20250101T010000.har.zip
+    python scripts/replay.py records/alice-....har.zip --shots out/   # 保存回放中的截图
+
+限制：设备验证、GitHub Mobile 批准这类靠轮询/刷新等待的步骤，回放时总是拿到第一次录到的页面，
+会一直等到超时（回放中等待时间已缩短）。
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from urllib.parse import parse_qs
+
+
+def har_entries(path):
+    """读取 HAR（.har 或 .har.zip）里的请求记录"""
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as z:
+            name = next(n for n in z.namelist() if n.endswith(".har"))
+            data = json.loads(z.read(name))
+    else:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    return data["log"]["entries"]
+
+
+def form_value(entries, url_part, fields):
+    """在 POST 到 url_part 的表单里找第一个存在的字段值"""
+    for e in entries:
+        req = e["request"]
+        if req["method"] != "POST" or url_part not in req["url"]:
+            continue
+        post = req.get("postData") or {}
+        params = {p["name"]: p.get("value", "") for p in post.get("params") or []}
+        if not params and post.get("text"):
+            params = {k: v[0] for k, v in parse_qs(post["text"]).items()}
+        for field in fields:
+            if params.get(field):
+                return params[field]
+    return None
+
+
+def load_info(har, info_path=None):
+    info_path = info_path or har.replace(".har.zip", ".json").replace(".har", ".json")
+    try:
+        with open(info_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        print(f"⚠️ 找不到录制信息 {info_path}，按无缓存状态回放")
+        return {}
+
+
+async def replay(har, info, code, shots_dir):
+    from playwright.async_api import async_playwright
+
+    from .footprint import viewport
+    from .github_secrets import SecretUpdater
+    from .login import STEALTH_JS, USER_AGENT, AutoLogin
+    from .net_filter import RequestFilter
+    from .runner import launch_options
+    from .telegram import Telegram
+
+    class OfflineTelegram(Telegram):
+        """回放用：不发送消息，验证码直接使用录制中的值"""
+
+        def wait_code(self, account, timeout=120):
+            return code
+
+    entries = har_entries(har)
+    username = info.get("username") or "replay"
+    password = form_value(entries, "github.com/session", ["password"]) or "replay"
+    al = AutoLogin(
+        username=username,
+        password=password,
+        gh_session="",
+        tg=OfflineTelegram(),
+        secret=SecretUpdater(),
+    )
+    # 还原录制时的初始状态，让 flow() 走同一条路径
+    al.cached = {"storage_state": {}} if info.get("cached") else None
+    al.verdict = info.get("verdict")
+    al.probe_source = info.get("probe_source") or ""
+    al.resume_at = info.get("resume_at")
+    if info.get("base_url"):
+        al.detected_region = info.get("region")
+        al.region_base_url = info["base_url"]
+
+    ok, err = False, ""
+    start = time.time()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(**launch_options())
+        try:
+            context = await browser.new_context(
+                viewport=viewport(),  # 与录制时相同（录制时总是需要截图）
+                user_agent=USER_AGENT,
+            )
+            # HAR 路由先注册，过滤器后注册先执行，放行的请求 fallback 到 HAR
+            await context.route_from_har(har, not_found="abort")
+            await RequestFilter().install(context)
+            context.on("response", al.timeline.on_response)
+            page = await context.new_page()
+            al.timeline.watch(page)
+            await page.add_init_script(STEALTH_JS)
+            try:
+                await al.flow(page, context)
+                ok = True
+            except Exception as e:
+                err = str(e)
+                await al.shot(page, "异常")
+            await context.close()
+        finally:
+            await browser.close()
+
+    if shots_dir:
+        os.makedirs(shots_dir, exist_ok=True)
+        for i, s in enumerate(al.shots):
+            with open(os.path.join(shots_dir, f"{i:02d}_{s['name']}.jpg"), 'wb') as f:
+                f.write(s["data"])
+
+    print("\n" + "=" * 50)
+    print(f"回放: {'✅ 成功' if ok else '❌ 失败'}（录制时: {'成功' if info.get('ok') else '失败'}）"
+          f"，耗时 {time.time() - start:.1f}s")
+    print(f"路径: {al.timeline.meta.get('path')}（录制时: {info.get('path')}）")
+    if err:
+        print(f"错误: {err}")
+    print(al.timeline.summary())
+    if shots_dir:
+        print(f"截图: {shots_dir}（{len(al.shots)} 张）")
+    print("=" * 50)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线回放录制的 ClawCloud 登录")
+    parser.add_argument("har", help="RECORD=1 生成的 .har.zip")
+    parser.add_argument("--info", help="录制信息 .json（默认与 HAR 同名）")
+    parser.add_argument("--shots", help="把回放中的截图保存到该目录")
+    args = parser.parse_args()
+
+    info = load_info(args.har, args.info)
+    code = form_value(har_entries(args.har), "github.com/sessions/two-factor", ["app_otp", "otp", "sms_otp"])
+
+    state_dir = tempfile.mkdtemp(prefix="clawcloud-replay-")
+    # 必须在导入 login 之前设置：不发通知、不写 Secret、不读写真实缓存
+    os.environ.update({
+        "TG_BOT_TOKEN": "",
+        "STATE_DIR": state_dir,
+        "RECORD": "0",
+        "TIMELINE_FILE": "",
+        "PROXY_DSN": "",
+        "TWO_FACTOR_WAIT": "10",
+    })
+    os.environ.pop("REPO_TOKEN", None)
+    try:
+        from . import login
+
+        login.DEVICE_VERIFY_WAIT = 5
+        ok = asyncio.run(replay(args.har, info, code, args.shots))
+    finally:
+        shutil.rmtree(state_dir, ignore_errors=True)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
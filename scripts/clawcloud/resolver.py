@@ -0,0 +1,132 @@
+"""
+选择器解析
+- 同时等待一个步骤的所有候选选择器，谁先可见用谁，不再逐个 is_visible 等待
+- 同时可见时按优先级选：上次命中的选择器排在前面（命中次数保存在 STATE_DIR/selectors.json）
+- 记录本次运行每个步骤的命中/未命中次数、首选命中次数和耗时
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+
+from .state_cache import STATE_DIR
+
+SELECTOR_FILE = os.path.join(STATE_DIR, "selectors.json")
+
+
+class SelectorResolver:
+    """所有账号共用的选择器解析器（见 shared()）"""
+
+    _shared = None
+    lock = threading.Lock()
+
+    def __init__(self, path=SELECTOR_FILE):
+        self.path = path
+        self.wins = self._read()  # 步骤 -> {选择器: 命中次数}
+        self.steps = {}  # 步骤 -> {"hits", "misses", "first", "seconds"}（仅本次运行）
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """写回命中次数；和文件里已有的记录取较大值，避免多个进程互相覆盖"""
+        with self.lock:
+            merged = self._read()
+            for step, wins in self.wins.items():
+                old = merged.setdefault(step, {})
+                for sel, n in wins.items():
+                    old[sel] = max(old.get(sel, 0), n)
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp = self.path + ".tmp"
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(merged, f, ensure_ascii=False, indent=2)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"保存选择器缓存失败: {e}")
+
+    def order(self, step, selectors):
+        """按历史命中次数排序（稳定排序，没有记录时保持原顺序）"""
+        wins = self.wins.get(step, {})
+        return sorted(selectors, key=lambda s: -wins.get(s, 0))
+
+    async def resolve(self, page, step, selectors, timeout=3000):
+        """
+        等待任意一个候选可见，返回 (locator, 选择器)，超时返回 (None, None)
+        多个同时可见时取优先级最高的
+        """
+        ordered = self.order(step, selectors)
+        t0 = time.monotonic()
+
+        async def visible(sel):
+            await page.locator(sel).first.wait_for(state='visible', timeout=timeout)
+            return sel
+
+        tasks = [asyncio.ensure_future(visible(s)) for s in ordered]
+        winner = None
+        try:
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    if not t.cancelled() and t.exception() is None:
+                        winner = t.result()
+                        break
+        finally:
+            for t in tasks:
+                if not t.done():
+                    t.cancel()
+            # 取走被取消任务的异常，避免 "exception was never retrieved"
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if winner is not None:
+            # 优先级更高的候选也已可见时用它
+            for sel in ordered[:ordered.index(winner)]:
+                try:
+                    if await page.locator(sel).first.is_visible():
+                        winner = sel
+                        break
+                except Exception:
+                    pass
+
+        self._record(step, ordered, winner, time.monotonic() - t0)
+        if winner is None:
+            return None, None
+        return page.locator(winner).first, winner
+
+    def _record(self, step, ordered, winner, seconds):
+        st = self.steps.setdefault(step, {"hits": 0, "misses": 0, "first": 0, "seconds": 0.0})
+        st["seconds"] += seconds
+        if winner is None:
+            st["misses"] += 1
+            return
+        st["hits"] += 1
+        if winner == ordered[0]:
+            st["first"] += 1
+        wins = self.wins.setdefault(step, {})
+        wins[winner] = wins.get(winner, 0) + 1
+
+    def stats(self):
+        """本次运行每个步骤的统计"""
+        return {step: dict(st, seconds=round(st["seconds"], 2)) for step, st in self.steps.items()}
+
+    def summary(self):
+        if not self.steps:
+            return "选择器: 无"
+        parts = [
+            f"{step} {st['hits']}/{st['hits'] + st['misses']}（首选 {st['first']}，{st['seconds']:.1f}s）"
+            for step, st in self.steps.items()
+        ]
+        return "选择器: " + " · ".join(parts)
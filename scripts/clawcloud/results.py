@@ -0,0 +1,171 @@
+"""
+运行结果记录
+- 每次运行结束后，每个账号追加一行 JSON 到 RESULTS_FILE（默认 STATE_DIR/results.jsonl，随 .state/ 缓存保存）
+- 记录耗时、登录路径、区域、失败原因等，只追加不修改
+- 查询: python scripts/results.py [--days 30] [--json]
+    各登录路径的 p50 / p95 耗时
+    每个账号、每个区域的失败率
+    每个账号距上次成功保活的时间（超过 KEEPALIVE_HOURS 的标出）
+"""
+
+import argparse
+import json
+import math
+import os
+import threading
+import time
+
+from .state_cache import STATE_DIR
+
+RESULTS_FILE = os.environ.get("RESULTS_FILE", os.path.join(STATE_DIR, "results.jsonl")).strip()
+
+
+def make_row(result, meta, run_id):
+    """AutoLogin 的结果 + 时间线附加信息 -> 一行记录"""
+    mem = result.get("mem") or {}
+    return {
+        "at": int(time.time()),
+        "run_id": run_id,
+        "username": result["username"],
+        "ok": result["ok"],
+        "error": result["error"] or "",
+        "path": meta.get("path") or "-",
+        "probe": meta.get("probe"),
+        "region": result["region"] or "-",
+        "seconds": result["seconds"],
+        "retries": result.get("retries", 0),
+        "peak_rss_mb": mem.get("peak_rss_mb"),
+    }
+
+
+class ResultStore:
+    """只追加的 JSON lines 文件"""
+
+    lock = threading.Lock()
+
+    def __init__(self, path=RESULTS_FILE):
+        self.path = path
+
+    def append(self, rows):
+        if not self.path or not rows:
+            return
+        with self.lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    for row in rows:
+                        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"写入运行结果失败: {e}")
+
+    def read(self, since=0):
+        """读取 at >= since 的记录，跳过损坏的行（例如写入时被中断）"""
+        rows = []
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue
+                    if row.get("at", 0) >= since:
+                        rows.append(row)
+        except OSError:
+            pass
+        return rows
+
+
+def percentile(values, q):
+    """最近秩百分位（第 ceil(q * n) 个），values 需已排序"""
+    return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+
+def path_stats(rows):
+    """登录路径 -> {runs, ok, p50, p95}，耗时只统计成功的运行"""
+    groups = {}
+    for r in rows:
+        groups.setdefault(r["path"], []).append(r)
+    stats = {}
+    for path, rs in sorted(groups.items()):
+        ts = sorted(r["seconds"] for r in rs if r["ok"])
+        stats[path] = {
+            "runs": len(rs),
+            "ok": sum(1 for r in rs if r["ok"]),
+            "p50": percentile(ts, 0.5) if ts else None,
+            "p95": percentile(ts, 0.95) if ts else None,
+        }
+    return stats
+
+
+def failure_rates(rows, key):
+    """按 key（username / region）分组的失败率，失败率高的在前"""
+    groups = {}
+    for r in rows:
+        g = groups.setdefault(r.get(key) or "-", {"runs": 0, "failed": 0, "last_error": ""})
+        g["runs"] += 1
+        if not r["ok"]:
+            g["failed"] += 1
+            g["last_error"] = r["error"]
+    for g in groups.values():
+        g["rate"] = round(g["failed"] / g["runs"], 3)
+    return dict(sorted(groups.items(), key=lambda kv: (-kv[1]["rate"], kv[0])))
+
+
+def last_success(rows, now=None):
+    """账号 -> 距上次成功的秒数（从未成功为 None），最久的在前"""
+    now = now or time.time()
+    last = {}
+    for r in rows:
+        last.setdefault(r["username"], None)
+        if r["ok"]:
+            last[r["username"]] = max(last[r["username"]] or 0, r["at"])
+    ages = {u: (now - at if at else None) for u, at in last.items()}
+    return dict(sorted(ages.items(), key=lambda kv: -(kv[1] if kv[1] is not None else float("inf"))))
+
+
+def main():
+    from .scheduler import KEEPALIVE_HOURS, fmt_delta
+
+    parser = argparse.ArgumentParser(description="ClawCloud 运行结果统计")
+    parser.add_argument("--days", type=float, default=0, help="只统计最近 N 天，默认全部")
+    parser.add_argument("--json", action="store_true", help="输出 JSON")
+    args = parser.parse_args()
+
+    since = time.time() - args.days * 86400 if args.days else 0
+    # 距上次成功总是看全部记录，--days 只影响耗时和失败率
+    all_rows = ResultStore().read()
+    rows = [r for r in all_rows if r.get("at", 0) >= since]
+    report = {
+        "paths": path_stats(rows),
+        "accounts": failure_rates(rows, "username"),
+        "regions": failure_rates(rows, "region"),
+        "last_success": last_success(all_rows),
+    }
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    if not all_rows:
+        print(f"没有运行记录（{RESULTS_FILE}）")
+        return
+
+    def sec(v):
+        return f"{v:.1f}s" if v is not None else "-"
+
+    print(f"共 {len(rows)} 条记录" + (f"（最近 {args.days:g} 天）" if args.days else ""))
+    print(f"\n{'路径':<16} {'次数':>5} {'成功':>5} {'p50':>8} {'p95':>8}")
+    for path, s in report["paths"].items():
+        print(f"{path:<16} {s['runs']:>5} {s['ok']:>5} {sec(s['p50']):>8} {sec(s['p95']):>8}")
+
+    for title, key in (("账号", "accounts"), ("区域", "regions")):
+        print(f"\n{title:<22} {'次数':>5} {'失败率':>7}  最近错误")
+        for name, g in report[key].items():
+            print(f"{name:<24} {g['runs']:>5} {g['rate']:>7.0%}  {g['last_error'][:60]}")
+
+    print(f"\n{'账号':<22} 距上次成功")
+    for name, age in report["last_success"].items():
+        warn = " ⚠️ 超过保活间隔" if age is None or age > KEEPALIVE_HOURS * 3600 else ""
+        print(f"{name:<24} {fmt_delta(age) if age is not None else '从未成功'}{warn}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+运行内重试与熔断
+- 导航和 API 调用失败（超时、连接错误、5xx）时按步骤的重试预算重试，指数退避 + 随机抖动
+- 每个上游主机（github.com、claw.cloud、api.telegram.org ……）一个熔断器，所有账号共用：
+  连续失败 BREAKER_THRESHOLD 次后打开，BREAKER_COOLDOWN 秒内直接失败，不再耗尽整个任务的超时；
+  冷却后只放行一次试探，成功即关闭
+- 走代理的请求按 (代理, 主机) 分开熔断：坏掉的代理只熔断自己，不连累直连或其他代理的账号
+- 重试次数计入时间线（retries 计数），熔断状态在运行汇总中输出
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+RETRY_ATTEMPTS = int(os.environ.get("RETRY_ATTEMPTS", "3"))  # 默认每个步骤最多尝试次数
+RETRY_BASE = float(os.environ.get("RETRY_BASE_SECONDS", "1"))  # 第一次重试前的最长等待
+RETRY_MAX = float(os.environ.get("RETRY_MAX_SECONDS", "20"))  # 单次等待上限
+BREAKER_THRESHOLD = int(os.environ.get("BREAKER_THRESHOLD", "5"))  # 连续失败多少次后熔断，0 关闭熔断
+BREAKER_COOLDOWN = float(os.environ.get("BREAKER_COOLDOWN", "120"))  # 熔断持续秒数
+
+# 主机名后缀 -> 熔断器名称（同一服务的子域名共用一个熔断器）
+HOSTS = ("github.com", "claw.cloud", "api.telegram.org", "api.github.com")
+
+
+class CircuitOpen(Exception):
+    """熔断器打开，调用被直接拒绝"""
+
+
+def host_key(url, via=""):
+    """
+    URL -> 熔断器名称，如 https://ap-southeast-1.console.claw.cloud/apps -> claw.cloud
+    via: 经过的代理（不含账号密码），如 "claw.cloud via http://1.2.3.4:8080"
+    """
+    host = urlparse(url).hostname or url
+    for h in sorted(HOSTS, key=len, reverse=True):
+        if host == h or host.endswith("." + h):
+            host = h
+            break
+    return f"{host} via {via}" if via else host
+
+
+def backoff(attempt, base=RETRY_BASE, cap=RETRY_MAX):
+    """第 attempt 次重试前的等待秒数（full jitter）"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def transient(e):
+    """是否值得重试：超时、连接错误（浏览器 net::ERR_*，requests 的异常都是 OSError）"""
+    if isinstance(e, CircuitOpen):
+        return False
+    if isinstance(e, (OSError, asyncio.TimeoutError)):
+        return True
+    msg = str(e)
+    return "Timeout" in msg or "net::ERR_" in msg
+
+
+def bad_status(r):
+    """HTTP 响应是否算作上游故障（5xx、429）"""
+    code = getattr(r, "status_code", 0)
+    return code >= 500 or code == 429
+
+
+class Breaker:
+    """单个上游主机的熔断器"""
+
+    lock = threading.Lock()
+    registry = {}  # 名称 -> Breaker，进程内共享（守护进程中跨任务保留）
+
+    def __init__(self, name, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0  # 连续失败次数
+        self.opened_at = None
+        self.probe_at = None  # 半开时放行的试探开始时间
+        self.trips = 0  # 打开过几次
+        self.rejected = 0  # 打开期间直接拒绝的调用
+
+    @classmethod
+    def get(cls, name):
+        with cls.lock:
+            if name not in cls.registry:
+                cls.registry[name] = cls(name)
+            return cls.registry[name]
+
+    def allow(self):
+        """
+        是否放行；冷却结束后只放行一次试探（半开），试探的结果决定关闭还是重新打开
+        试探没有回报结果（例如抛出了不重试的异常）时，再过一个冷却期放行下一次试探
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at >= self.cooldown and (self.probe_at is None or now - self.probe_at >= self.cooldown):
+                self.probe_at = now
+                return True
+            self.rejected += 1
+            return False
+
+    def success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probe_at = None
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            half_open = self.opened_at is not None
+            if self.threshold and (half_open or self.failures >= self.threshold):
+                if not half_open:
+                    self.trips += 1
+                self.opened_at = time.monotonic()
+                self.probe_at = None
+
+    def check(self):
+        if not self.allow():
+            raise CircuitOpen(f"{self.name} 连续失败 {self.failures} 次，已熔断")
+
+    @classmethod
+    def summary(cls):
+        """有过失败的熔断器状态，如 "github.com 熔断中（打开 1 次，拒绝 4 次）"，没有返回空字符串"""
+        parts = []
+        with cls.lock:
+            for b in cls.registry.values():
+                if not (b.trips or b.failures):
+                    continue
+                if b.opened_at is not None and time.monotonic() - b.opened_at < b.cooldown:
+                    state = "熔断中"
+                elif b.opened_at is not None:
+                    state = "半开"
+                else:
+                    state = "正常"
+                parts.append(f"{b.name} {state}（连续失败 {b.failures}，打开 {b.trips} 次，拒绝 {b.rejected} 次）")
+        return "，".join(parts)
+
+
+async def retry_async(fn, breaker, attempts=RETRY_ATTEMPTS, on_retry=None, retry_on=transient):
+    """
+    调用 fn()（协程函数），可重试的异常按退避重试，最多 attempts 次
+    on_retry(次数, 异常, 等待秒数) 在每次重试前调用（记日志、计数）
+    """
+    for i in range(max(1, attempts)):
+        breaker.check()
+        try:
+            result = await fn()
+        except Exception as e:
+            if not retry_on(e):
+                raise
+            breaker.failure()
+            if i + 1 >= attempts:
+                raise
+            delay = backoff(i)
+            if on_retry:
+                on_retry(i + 1, e, delay)
+            await asyncio.sleep(delay)
+            continue
+        breaker.success()
+        return result
+
+
+def retry_sync(fn, breaker, attempts=RETRY_ATTEMPTS, on_retry=None, retry_on=transient, bad=bad_status):
+    """
+    同步版本（requests）：异常或 bad(响应) 为真时重试
+    最后一次仍是坏响应时原样返回，由调用方按状态码处理
+    """
+    for i in range(max(1, attempts)):
+        breaker.check()
+        try:
+            result = fn()
+        except Exception as e:
+            if not retry_on(e):
+                raise
+            breaker.failure()
+            if i + 1 >= attempts:
+                raise
+            err = e
+        else:
+            if not bad(result):
+                breaker.success()
+                return result
+            breaker.failure()
+            if i + 1 >= attempts:
+                return result
+            err = f"HTTP {result.status_code}"
+        delay = backoff(i)
+        if on_retry:
+            on_retry(i + 1, err, delay)
+        time.sleep(delay)
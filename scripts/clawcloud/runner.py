@@ -0,0 +1,238 @@
+"""
+多账号运行
+- 读取账号配置，为每个账号创建 AutoLogin
+- 先走 HTTP 快速保活和会话预检，只有还需要浏览器的账号才启动 Chromium
+- 结束后统一写入 Secret、发送汇总
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+
+from .footprint import launch_args, report
+from .github_secrets import save_secrets
+from .login import CONCURRENCY, FAST_KEEPALIVE, LAUNCH_ARGS, PROXY_DSN, SESSION_PROBE, AutoLogin
+from .proxy_pool import ProxyPool, split_proxies
+from .resolver import SelectorResolver
+from .results import ResultStore, make_row
+from .retry import Breaker
+from .timeline import TIMELINE_FILE
+
+
+def secret_key(username):
+    """用户名 -> Secret 名称后缀，如 foo-bar -> FOO_BAR"""
+    return re.sub(r'[^A-Z0-9]', '_', username.upper())
+
+
+def load_accounts():
+    """
+    读取账号列表
+    - GH_ACCOUNTS: JSON 数组，如 [{"username": "a", "password": "p", "session": "..."}]
+      未填 session 时从 GH_SESSION_<用户名> 读取（环境变量，或 GH_SESSIONS 中的同名键）
+      可选 "humanize": "normal" / "fast" / "off"，覆盖 HUMANIZE
+    - 未配置 GH_ACCOUNTS 时回退到单账号 GH_USERNAME / GH_PASSWORD / GH_SESSION
+    """
+    raw = os.environ.get('GH_ACCOUNTS', '').strip()
+    if not raw:
+        return [{
+            "username": os.environ.get('GH_USERNAME'),
+            "password": os.environ.get('GH_PASSWORD'),
+            "session": os.environ.get('GH_SESSION', ''),
+            "secret_name": 'GH_SESSION',
+            "humanize": None,
+        }]
+
+    try:
+        items = json.loads(raw)
+        sessions = json.loads(os.environ.get('GH_SESSIONS') or '{}')
+    except ValueError as e:
+        print(f"❌ GH_ACCOUNTS 解析失败: {e}")
+        return []
+
+    accounts = []
+    for item in items:
+        username = item.get("username")
+        if not username:
+            continue
+        secret_name = f"GH_SESSION_{secret_key(username)}"
+        session = item.get("session") or os.environ.get(secret_name) or sessions.get(secret_name) or ''
+        accounts.append({
+            "username": username,
+            "password": item.get("password"),
+            "session": session,
+            "secret_name": secret_name,
+            "humanize": item.get("humanize"),
+        })
+    return accounts
+
+
+def launch_options():
+    """浏览器启动参数（含代理配置解析）"""
+    options = {
+        "headless": True,
+        "args": list(LAUNCH_ARGS) + launch_args(),
+    }
+
+    # 代理按账号设置在上下文上，浏览器本身只需要一个占位的全局代理
+    # 只在确实有代理时设置：PROXY_DSN 只有分隔符时上下文不带代理，请求会发往占位地址
+    if split_proxies(PROXY_DSN):
+        options["proxy"] = {"server": "http://per-context"}
+
+    return options
+
+
+def summarize(results, tg):
+    """汇总所有账号的结果"""
+    ok_count = sum(1 for r in results if r["ok"])
+    lines = []
+    for r in results:
+        status = "✅" if r["ok"] else "❌"
+        line = f"{status} {r['username']} ({r['region'] or '-'}, {r['seconds']}s)"
+        if r.get("net"):
+            line += f" 拦截 {r['net']['blocked']} 个请求/~{r['net']['saved_kb']}KB"
+        if r.get("retries"):
+            line += f" 重试 {r['retries']} 次"
+        if (r.get("mem") or {}).get("peak_rss_mb"):
+            line += f" 内存峰值 {r['mem']['peak_rss_mb']}MB(+{r['mem']['rss_delta_mb']})"
+        if r["error"]:
+            line += f" {r['error']}"
+        lines.append(line)
+
+    breakers = Breaker.summary()
+    if breakers:
+        lines.append(f"🔌 {breakers}")
+
+    print("\n" + "="*50)
+    print(f"📊 汇总: {ok_count}/{len(results)} 成功")
+    for line in lines:
+        print(line)
+    print("="*50 + "\n")
+
+    # 单账号时 notify() 已经发过了
+    if len(results) > 1:
+        tg.send(f"<b>📊 ClawCloud 批量登录汇总</b>\n\n<b>成功:</b> {ok_count}/{len(results)}\n\n" + "\n".join(lines))
+
+
+async def run_accounts(logins, concurrency=CONCURRENCY, browser=None):
+    """
+    并发登录多个账号：共享一个浏览器，每个账号独立上下文，Semaphore 控制并发数
+    browser: 使用调用方提供的浏览器（如守护进程里的常驻浏览器），不自己启动和关闭
+    """
+    print("\n" + "="*50)
+    print(f"🚀 ClawCloud 自动登录（{len(logins)} 个账号，并发 {concurrency}）")
+    print("="*50 + "\n")
+
+    results = [None] * len(logins)
+
+    # 探测代理并为每个账号选择代理
+    pool = ProxyPool.from_env()
+    if pool.proxies:
+        await asyncio.to_thread(pool.probe_all)
+        for al in logins:
+            al.use_proxies(pool)
+
+    # 缺少凭据的账号不需要浏览器
+    pending = []
+    for i, al in enumerate(logins):
+        if al.username and al.password:
+            pending.append(i)
+        else:
+            results[i] = await al.login(None)
+
+    # 先走 HTTP 快速保活，成功的账号不再需要浏览器
+    if pending and FAST_KEEPALIVE:
+        async def fast_one(al):
+            """异常（如缓存的 storage state 格式不对）只让这个账号改走浏览器"""
+            try:
+                return await al.http_keepalive()
+            except Exception as e:
+                al.log(f"HTTP 保活异常，改用浏览器: {e}", "WARN")
+                return None
+
+        fast = await asyncio.gather(*(fast_one(logins[i]) for i in pending))
+        for i, r in zip(list(pending), fast):
+            if r:
+                results[i] = r
+                pending.remove(i)
+
+    # 其余账号预检 Cookie 状态，决定浏览器里走哪条路径（控制台 Cookie 有效的账号已在上面 HTTP 保活）
+    if pending and SESSION_PROBE:
+        async def probe_one(al):
+            """预检出错时不下结论（verdict 为 None），按默认流程走，不影响其他账号"""
+            try:
+                await al.probe()
+            except Exception as e:
+                al.verdict, al.probe_source = None, ""
+                al.log(f"会话预检异常，走默认流程: {e}", "WARN")
+
+        await asyncio.gather(*(probe_one(logins[i]) for i in pending))
+
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(i, b):
+        """单个账号的异常（如浏览器断开时新建上下文失败）只算这个账号失败，不中断其他账号和后续汇总"""
+        async with sem:
+            al = logins[i]
+            start = time.time()
+            try:
+                results[i] = await al.login(b)
+            except Exception as e:
+                al.log(f"异常: {e}", "ERROR")
+                results[i] = al.result(False, str(e) or type(e).__name__, start)
+
+    if pending and browser:
+        await asyncio.gather(*(one(i, browser) for i in pending))
+    elif pending:
+        from playwright.async_api import async_playwright
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(**launch_options())
+            try:
+                await asyncio.gather(*(one(i, browser) for i in pending))
+            finally:
+                await browser.close()
+
+    tg = logins[0].tg
+    await asyncio.to_thread(save_secrets, logins[0].secret, tg)
+    resolver = SelectorResolver.shared()
+    if resolver.steps:
+        print(resolver.summary())
+        resolver.save()
+    for al in logins:
+        al.timeline.export()
+    ResultStore().append([make_row(r, al.timeline.meta, al.timeline.run_id)
+                          for al, r in zip(logins, results) if r["username"]])
+    summarize(results, tg)
+    mem = report(results)
+    if mem:
+        print(mem)
+    # 等待后台队列里的通知全部发出
+    await asyncio.to_thread(tg.flush)
+    st = tg.stats
+    print(f"📨 Telegram: {st['requests']} 次请求，{st['seconds']:.1f}s，上传 {st['bytes'] // 1024} KB，"
+          f"重试 {st['retries']} 次")
+    if TIMELINE_FILE:
+        print(f"⏱ 时间线已写入 {TIMELINE_FILE}")
+    return results
+
+
+
+def make_logins(accounts, tg, secret, multi=None):
+    """为 load_accounts() 返回的账号创建 AutoLogin，共用一个 Telegram 和 Secret 更新器"""
+    if multi is None:
+        multi = len(accounts) > 1
+    return [
+        AutoLogin(
+            username=a["username"],
+            password=a["password"],
+            gh_session=a["session"],
+            secret_name=a["secret_name"],
+            tag=a["username"] if multi else "",
+            tg=tg,
+            secret=secret,
+            humanize=a.get("humanize"),
+        )
+        for a in accounts
+    ]
@@ -0,0 +1,215 @@
+"""
+按账号调度保活
+- 每个账号保存下次到期时间（STATE_DIR/schedule.json），成功后 KEEPALIVE_HOURS 小时再次保活，并随机提前最多 SCHEDULE_JITTER_HOURS 小时，把账号错开
+- 失败后指数退避重试：BACKOFF_MINUTES 起，每次翻倍，最多 BACKOFF_MAX_HOURS
+- 用最小堆按到期时间取账号，每次最多处理 SCHEDULE_BATCH 个（最早到期的优先），其余留到下一轮
+
+用法:
+    python scripts/scheduler.py run      # 运行一轮：只登录已到期的账号（--all 忽略到期时间）
+    python scripts/scheduler.py loop     # 常驻：睡到下一个账号到期再运行
+    python scripts/scheduler.py due      # 输出已到期账号数（GitHub Actions 里写入 GITHUB_OUTPUT）
+    python scripts/scheduler.py status   # 查看每个账号的到期时间
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import os
+import random
+import sys
+import time
+
+from .state_cache import STATE_DIR
+
+SCHEDULE_FILE = os.path.join(STATE_DIR, "schedule.json")
+KEEPALIVE_HOURS = float(os.environ.get("KEEPALIVE_HOURS", "96"))  # 成功后多久再次保活
+SCHEDULE_JITTER_HOURS = float(os.environ.get("SCHEDULE_JITTER_HOURS", "12"))  # 随机提前量
+BACKOFF_MINUTES = float(os.environ.get("BACKOFF_MINUTES", "30"))  # 第一次失败后的重试间隔
+BACKOFF_MAX_HOURS = float(os.environ.get("BACKOFF_MAX_HOURS", "12"))
+SCHEDULE_BATCH = int(os.environ.get("SCHEDULE_BATCH", "0"))  # 每轮最多处理的账号数，0 为不限
+
+
+def fmt_delta(seconds):
+    sign = "-" if seconds < 0 else ""
+    seconds = abs(int(seconds))
+    if seconds >= 86400:
+        return f"{sign}{seconds // 86400}d{seconds % 86400 // 3600}h"
+    if seconds >= 3600:
+        return f"{sign}{seconds // 3600}h{seconds % 3600 // 60}m"
+    return f"{sign}{seconds // 60}m"
+
+
+class Schedule:
+    """持久化的账号到期时间 + 按到期时间排序的最小堆"""
+
+    def __init__(self, path=SCHEDULE_FILE):
+        self.path = path
+        self.entries = {}  # 账号 -> {"due", "last_run", "last_ok", "failures"}
+        self.heap = []  # (到期时间, 账号)，过期条目在弹出时跳过
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.rebuild()
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"保存调度表失败: {e}")
+
+    def rebuild(self):
+        self.heap = [(e["due"], name) for name, e in self.entries.items()]
+        heapq.heapify(self.heap)
+
+    def sync(self, usernames, now=None):
+        """新账号立即到期，已删除的账号移出调度表"""
+        now = now or time.time()
+        usernames = set(usernames)
+        changed = False
+        for name in usernames - set(self.entries):
+            self.entries[name] = {"due": now, "last_run": 0, "last_ok": 0, "failures": 0}
+            changed = True
+        for name in set(self.entries) - usernames:
+            del self.entries[name]
+            changed = True
+        if changed:
+            self.rebuild()
+
+    def peek(self):
+        """下一个到期的 (时间, 账号)，没有返回 None"""
+        while self.heap:
+            due, name = self.heap[0]
+            if name in self.entries and self.entries[name]["due"] == due:
+                return due, name
+            heapq.heappop(self.heap)
+        return None
+
+    def pop_due(self, now=None, limit=SCHEDULE_BATCH):
+        """弹出已到期的账号，最早到期的在前"""
+        now = now or time.time()
+        out = []
+        while not limit or len(out) < limit:
+            top = self.peek()
+            if not top or top[0] > now:
+                break
+            heapq.heappop(self.heap)
+            out.append(top[1])
+        return out
+
+    def due_count(self, now=None):
+        now = now or time.time()
+        return sum(1 for e in self.entries.values() if e["due"] <= now)
+
+    def record(self, name, ok, now=None):
+        """根据结果计算下次到期时间"""
+        now = now or time.time()
+        e = self.entries.get(name)
+        if e is None:
+            return
+        e["last_run"] = now
+        if ok:
+            e["last_ok"] = now
+            e["failures"] = 0
+            delay = KEEPALIVE_HOURS * 3600 - random.uniform(0, SCHEDULE_JITTER_HOURS * 3600)
+        else:
+            e["failures"] += 1
+            delay = min(BACKOFF_MINUTES * 60 * 2 ** (e["failures"] - 1), BACKOFF_MAX_HOURS * 3600)
+            delay *= random.uniform(0.8, 1.2)
+        e["due"] = now + max(60, delay)
+        heapq.heappush(self.heap, (e["due"], name))
+
+
+async def run_due(schedule, force=False, tg=None, secret=None):
+    """运行一轮：登录到期账号并记录结果，返回结果列表"""
+    # 账号配置和登录流程用到时才导入，due / status 不需要
+    from .github_secrets import SecretUpdater
+    from .runner import load_accounts, make_logins, run_accounts
+    from .telegram import Telegram
+
+    accounts = {a["username"]: a for a in load_accounts() if a["username"]}
+    schedule.sync(accounts)
+    names = sorted(accounts) if force else schedule.pop_due()
+    if not names:
+        top = schedule.peek()
+        if top:
+            print(f"⏳ 没有到期账号，下一个 {top[1]} 在 {fmt_delta(top[0] - time.time())} 后")
+        schedule.save()
+        return []
+
+    print(f"📅 本轮 {len(names)} 个账号: {', '.join(names)}")
+    tg = tg or Telegram()
+    secret = secret or SecretUpdater()
+    logins = make_logins([accounts[n] for n in names], tg, secret, multi=len(accounts) > 1)
+    results = await run_accounts(logins)
+    for r in results:
+        schedule.record(r["username"], r["ok"])
+    schedule.save()
+    return results
+
+
+async def loop(max_sleep=3600):
+    """常驻调度：睡到下一个账号到期；最多睡 max_sleep 秒以便发现新增账号"""
+    from .github_secrets import SecretUpdater
+    from .telegram import Telegram
+
+    schedule = Schedule()
+    tg = Telegram()
+    secret = SecretUpdater()
+    while True:
+        await run_due(schedule, tg=tg, secret=secret)
+        top = schedule.peek()
+        wait = max_sleep if not top else min(max_sleep, max(1, top[0] - time.time()))
+        await asyncio.sleep(wait)
+
+
+def status(schedule):
+    from .runner import load_accounts
+
+    schedule.sync(a["username"] for a in load_accounts() if a["username"])
+    now = time.time()
+    print(f"{'账号':<24} {'到期':>8} {'上次成功':>10} 失败")
+    for name, e in sorted(schedule.entries.items(), key=lambda kv: kv[1]["due"]):
+        last_ok = fmt_delta(now - e["last_ok"]) + "前" if e["last_ok"] else "-"
+        print(f"{name:<24} {fmt_delta(e['due'] - now):>8} {last_ok:>10} {e['failures']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ClawCloud 保活调度")
+    parser.add_argument("cmd", choices=["run", "loop", "due", "status"])
+    parser.add_argument("--all", action="store_true", help="run: 忽略到期时间，登录全部账号")
+    args = parser.parse_args()
+
+    if args.cmd == "loop":
+        asyncio.run(loop())
+        return
+
+    schedule = Schedule()
+    if args.cmd == "status":
+        status(schedule)
+    elif args.cmd == "due":
+        from .runner import load_accounts
+
+        schedule.sync(a["username"] for a in load_accounts() if a["username"])
+        count = schedule.due_count()
+        print(f"到期账号: {count}")
+        if os.environ.get("GITHUB_OUTPUT"):
+            with open(os.environ["GITHUB_OUTPUT"], 'a') as f:
+                f.write(f"count={count}\n")
+    else:
+        results = asyncio.run(run_due(schedule, force=args.all))
+        if not all(r["ok"] for r in results):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+会话预检
+- 启动浏览器前用普通 HTTP 请求判断账号的登录状态，选择浏览器里走哪条路径：
+    valid   -> ClawCloud 控制台 Cookie 有效，浏览器用缓存状态直接保活
+    github  -> 只有 GitHub Cookie 有效，跳过缓存状态检查，直接走 OAuth
+    expired -> 都已失效，不加载旧 Cookie，直接走密码登录
+- 控制台 Cookie 有效时的 HTTP 保活不靠预检分派：FAST_KEEPALIVE 开启时 HTTP 保活先于预检运行，
+  成功的账号不再预检；预检只在它失败后运行（把“控制台已失效”传进来），通常只会得出 github / expired。
+  只有 HTTP 保活遇到网络错误、或 FAST_KEEPALIVE=0 时才可能得出 valid
+- 结果按 Cookie 指纹缓存 PROBE_TTL 秒（STATE_DIR/probe.json），Cookie 变化后自动失效
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .http_keepalive import api_authenticated, claw_cookies, signed_in_page
+from .state_cache import STATE_DIR
+
+PROBE_TTL = int(os.environ.get("PROBE_TTL", "600"))
+PROBE_FILE = os.path.join(STATE_DIR, "probe.json")
+GITHUB_PROBE_URL = "https://github.com/settings/profile"  # 未登录时会 302 到 /login
+
+VALID = "valid"
+GITHUB_ONLY = "github"
+EXPIRED = "expired"
+
+
+def github_cookies(storage_state):
+    """storage state 里的 GitHub user_session"""
+    return [
+        c["value"] for c in (storage_state or {}).get("cookies", [])
+        if c.get("name") == "user_session" and c.get("domain", "").lstrip(".").endswith("github.com")
+    ]
+
+
+class SessionProbe:
+    """用 requests 检查 ClawCloud 和 GitHub 的登录状态"""
+
+    def __init__(self, storage_state, gh_session, base_url, user_agent, proxy="", timeout=10):
+        import requests
+
+        self.base_url = (base_url or "").rstrip("/")
+        self.timeout = timeout
+        self.claw = claw_cookies(storage_state)
+        # 候选 GitHub Cookie：(来源, 值)，缓存状态里的优先（通常更新）
+        self.candidates = [("state", v) for v in github_cookies(storage_state)]
+        if gh_session and gh_session not in [v for _, v in self.candidates]:
+            self.candidates.append(("secret", gh_session))
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": user_agent, "Accept-Language": "en-US,en;q=0.9"})
+        if proxy:
+            self.session.proxies = {"http": proxy, "https": proxy}
+
+    def fingerprint(self):
+        """参与判断的 Cookie 和区域的指纹，用作缓存键"""
+        parts = [self.base_url] + sorted(f"{c['name']}={c['value']}" for c in self.claw)
+        parts += [v for _, v in self.candidates]
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()[:16]
+
+    def check_claw(self):
+        """区域控制台是否已登录；没有 Cookie 返回 False，网络错误返回 None"""
+        import requests
+
+        if not self.claw or not self.base_url:
+            return False
+        for c in self.claw:
+            self.session.cookies.set(c["name"], c["value"], domain=c["domain"], path=c.get("path", "/"))
+        try:
+            r = self.session.get(f"{self.base_url}/", timeout=self.timeout, stream=True)
+            body = next(r.iter_content(65536), b"")  # 只读开头，够判断是不是登录页
+            r.close()
+            if not signed_in_page(r.status_code, r.url, body):
+                return False
+            return api_authenticated(self.session, self.base_url, self.timeout)
+        except requests.RequestException:
+            return None
+
+    def check_github(self):
+        """返回第一个有效的 GitHub Cookie 来源；都无效返回 ""，网络错误返回 None"""
+        import requests
+
+        for source, value in self.candidates:
+            try:
+                r = self.session.get(
+                    GITHUB_PROBE_URL,
+                    cookies={"user_session": value, "logged_in": "yes"},
+                    timeout=self.timeout,
+                    allow_redirects=False,
+                    stream=True,
+                )
+                r.close()
+            except requests.RequestException:
+                return None
+            if r.status_code == 200:
+                return source
+        return ""
+
+    def run(self, claw=None):
+        """
+        返回 (结论, GitHub Cookie 来源)，无法判断时结论为 None
+        claw: 调用方已知的控制台状态（如 HTTP 保活刚失败），None 时自己检查
+        """
+        try:
+            if claw is None:
+                claw = self.check_claw()
+            if claw:
+                return VALID, ""
+            source = self.check_github()
+            if source is None:
+                return None, ""
+            return (GITHUB_ONLY if source else EXPIRED), source
+        finally:
+            self.session.close()
+
+
+class ProbeCache:
+    """预检结果缓存：账号 -> {指纹, 结论, 来源, 时间}"""
+
+    lock = threading.Lock()
+
+    def __init__(self, path=PROBE_FILE, ttl=PROBE_TTL):
+        self.path = path
+        self.ttl = ttl
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, username, fingerprint):
+        if self.ttl <= 0:
+            return None
+        with self.lock:
+            e = self._read().get(username)
+        if e and e.get("key") == fingerprint and time.time() - e.get("at", 0) < self.ttl:
+            return e["verdict"], e.get("source", "")
+        return None
+
+    def put(self, username, fingerprint, verdict, source=""):
+        if self.ttl <= 0 or not verdict:
+            return
+        with self.lock:
+            data = self._read()
+            now = time.time()
+            # 顺便清理过期条目
+            data = {k: v for k, v in data.items() if now - v.get("at", 0) < self.ttl}
+            data[username] = {"key": fingerprint, "verdict": verdict, "source": source, "at": now}
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp = self.path + ".tmp"
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"保存预检缓存失败: {e}")
@@ -0,0 +1,71 @@
+"""
+截图处理
+- 直接截到内存（JPEG），不在工作目录写文件
+- 超过大小上限时降低质量重截；装了 Pillow 时先缩小分辨率
+- 计算图片指纹用于去重：有 Pillow 用 dHash（容忍细微差异），否则用内容哈希
+"""
+
+import hashlib
+import io
+import os
+
+SHOT_QUALITY = int(os.environ.get("SHOT_QUALITY", "70"))
+SHOT_MAX_BYTES = int(os.environ.get("SHOT_MAX_KB", "300")) * 1024
+SHOT_MAX_WIDTH = int(os.environ.get("SHOT_MAX_WIDTH", "1280"))
+SIMILAR_BITS = 4  # dHash 汉明距离不超过该值视为同一画面
+
+
+def shrink(data, quality):
+    """缩小到 SHOT_MAX_WIDTH 以内并重新编码，没有 Pillow 时原样返回"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return data
+    try:
+        img = Image.open(io.BytesIO(data))
+        if img.width <= SHOT_MAX_WIDTH:
+            return data
+        img = img.convert("RGB")
+        img.thumbnail((SHOT_MAX_WIDTH, SHOT_MAX_WIDTH * img.height // img.width))
+        out = io.BytesIO()
+        img.save(out, "JPEG", quality=quality, optimize=True)
+        return out.getvalue()
+    except Exception:
+        return data
+
+
+async def capture(page):
+    """截图并压缩到 SHOT_MAX_BYTES 以内，失败返回 None"""
+    data = None
+    for quality in (SHOT_QUALITY, 45, 25):
+        try:
+            data = await page.screenshot(type='jpeg', quality=quality)
+        except Exception:
+            return data
+        data = shrink(data, quality)
+        if len(data) <= SHOT_MAX_BYTES:
+            break
+    return data
+
+
+def image_hash(data):
+    """图片指纹：dHash（int）或内容 sha1（str）"""
+    try:
+        from PIL import Image
+
+        img = Image.open(io.BytesIO(data)).convert("L").resize((9, 8))
+        px = list(img.getdata())
+        bits = 0
+        for row in range(8):
+            for col in range(8):
+                bits = (bits << 1) | (px[row * 9 + col] > px[row * 9 + col + 1])
+        return bits
+    except Exception:
+        return hashlib.sha1(data).hexdigest()
+
+
+def similar(a, b):
+    """两个指纹是否属于几乎相同的画面"""
+    if isinstance(a, int) and isinstance(b, int):
+        return bin(a ^ b).count("1") <= SIMILAR_BITS
+    return a == b
@@ -0,0 +1,73 @@
+"""
+登录状态缓存
+- 保存 Playwright storage state（github.com 与 claw.cloud 的 Cookie、localStorage）和区域信息
+- 使用 NaCl SecretBox 加密落盘，密钥来自 STATE_KEY（未配置时使用账号密码）
+- 下次运行时恢复，状态有效则直接保活，跳过 OAuth
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+
+STATE_DIR = os.environ.get("STATE_DIR", ".state").strip() or ".state"
+STATE_KEY = os.environ.get("STATE_KEY", "").strip()
+
+
+class StateCache:
+    """单个账号的加密状态文件"""
+
+    def __init__(self, username, secret, directory=STATE_DIR, kind="state"):
+        self.username = username or ""
+        self.directory = directory
+        # 每个账号独立密钥：sha256(用户名 + 密钥材料)
+        material = STATE_KEY or secret or ""
+        self.ok = bool(self.username and material)
+        self.key = hashlib.sha256(f"{self.username}\0{material}".encode()).digest()
+        name = re.sub(r'[^A-Za-z0-9_.-]', '_', self.username)
+        self.path = os.path.join(directory, f"{name}.{kind}")
+
+    def load(self):
+        """读取并解密，失败（不存在/密钥变了/损坏）返回 None"""
+        if not self.ok or not os.path.exists(self.path):
+            return None
+        try:
+            from nacl import secret
+
+            with open(self.path, 'rb') as f:
+                raw = secret.SecretBox(self.key).decrypt(f.read())
+            return json.loads(raw.decode())
+        except Exception as e:
+            print(f"读取状态缓存失败: {e}")
+            return None
+
+    def save(self, storage_state, region=None, base_url=None, extra=None):
+        if not self.ok:
+            return False
+        try:
+            from nacl import secret
+
+            data = {
+                "storage_state": storage_state,
+                "region": region,
+                "base_url": base_url,
+                "saved_at": int(time.time()),
+                **(extra or {}),
+            }
+            encrypted = secret.SecretBox(self.key).encrypt(json.dumps(data).encode())
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(encrypted)
+            os.replace(tmp, self.path)
+            return True
+        except Exception as e:
+            print(f"保存状态缓存失败: {e}")
+            return False
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,262 @@
+"""
+Telegram 通知与验证码
+- 后台线程按顺序发送消息和截图相册
+- getUpdates 长轮询把 /code 分发给等待中的账号
+- requests 在第一次发送时才导入
+"""
+
+import json
+import os
+import queue
+import re
+import threading
+import time
+
+from .retry import Breaker, host_key, retry_sync
+
+TG_API_BASE = os.environ.get("TG_API_BASE", "https://api.telegram.org").rstrip("/")  # 自建 Bot API 或本地模拟服务
+# /code [账号] 验证码：6 位 TOTP 或 8 位恢复码，群里可能带 @机器人名
+CODE_PATTERN = re.compile(r"^/code(?:@\w+)?\s+(?:(\S+)\s+)?(\d{6,8})$")
+
+
+class Telegram:
+    """
+    Telegram 通知
+    - 复用一个 keep-alive 连接池
+    - send / photo / album 放进后台队列按顺序发送，不阻塞浏览器流程
+    - 多张截图合并成 sendMediaGroup 相册
+    - 退出前调用 flush() 等待队列发完
+    - 一个 getUpdates 长轮询线程把 /code 分发给各个等待中的账号
+    """
+
+    def __init__(self):
+        self.token = os.environ.get('TG_BOT_TOKEN')
+        self.chat_id = os.environ.get('TG_CHAT_ID')
+        self.ok = bool(self.token and self.chat_id)
+        self.api = f"{TG_API_BASE}/bot{self.token}"
+        self._session = None  # 第一次发送时才创建，未配置 Telegram 时不加载 requests
+        self.queue = queue.Queue()
+        self.worker = None
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "seconds": 0.0, "bytes": 0, "retries": 0}  # 后台发送统计
+        self.breaker = Breaker.get(host_key(TG_API_BASE))
+
+        # 验证码分发
+        self.waiters = {}  # 账号(小写) -> queue.Queue
+        self.prompts = {}  # 提示消息 message_id -> 账号(小写)，用于“回复消息”路由
+        self.poller = None
+
+    @property
+    def session(self):
+        """复用的 keep-alive 连接池，第一次使用时创建"""
+        with self.lock:
+            if self._session is None:
+                import requests
+
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=8)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def _start(self):
+        with self.lock:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._work, name="telegram-send", daemon=True)
+                self.worker.start()
+
+    def _work(self):
+        """后台线程：单线程按入队顺序发送"""
+        while True:
+            method, data, files, timeout, callback = self.queue.get()
+            t0 = time.monotonic()
+            try:
+                # 5xx / 429 / 连接错误时退避重试；Bot API 熔断时直接丢弃，不拖住退出前的 flush()
+                r = retry_sync(
+                    lambda: self.session.post(f"{self.api}/{method}", data=data, files=files, timeout=timeout),
+                    self.breaker,
+                    on_retry=self._on_retry,
+                )
+                if callback:
+                    callback(r.json().get("result") or {})
+            except:
+                pass
+            finally:
+                self.stats["requests"] += 1
+                self.stats["seconds"] += time.monotonic() - t0
+                self.stats["bytes"] += sum(len(f[1]) for f in (files or {}).values())
+                self.queue.task_done()
+
+    def _on_retry(self, n, e, delay):
+        self.stats["retries"] += 1
+
+    def _enqueue(self, method, data, files=None, timeout=30, callback=None):
+        self._start()
+        self.queue.put((method, data, files, timeout, callback))
+
+    def send(self, msg, prompt_for=None):
+        """
+        发送消息
+        prompt_for: 这是某个账号的验证码提示，回复这条消息的 /code 会交给该账号
+        """
+        if not self.ok:
+            return
+        callback = self._remember_prompt(prompt_for.lower()) if prompt_for else None
+        self._enqueue("sendMessage", {"chat_id": self.chat_id, "text": msg, "parse_mode": "HTML"},
+                      callback=callback)
+
+    def _remember_prompt(self, key):
+        """发送成功后记下提示消息的 message_id -> 账号，用于“回复消息”路由"""
+        def callback(result):
+            with self.lock:
+                self.prompts[result.get("message_id")] = key
+        return callback
+
+    def photo(self, data, caption="", filename="photo.jpg"):
+        """发送一张图片（内存中的字节）"""
+        if not self.ok or not data:
+            return
+        self._enqueue(
+            "sendPhoto",
+            {"chat_id": self.chat_id, "caption": caption[:1024]},
+            {"photo": (filename, data)},
+            timeout=60
+        )
+
+    def album(self, items):
+        """
+        发送多张图片，items 为 [(data, caption, filename), ...]
+        每 10 张一个相册（sendMediaGroup 上限），只剩 1 张时用 sendPhoto
+        """
+        items = [it for it in items if it[0]]
+        if not self.ok or not items:
+            return
+        for i in range(0, len(items), 10):
+            chunk = items[i:i + 10]
+            if len(chunk) == 1:
+                self.photo(*chunk[0])
+                continue
+            media, files = [], {}
+            for j, (data, caption, filename) in enumerate(chunk):
+                media.append({"type": "photo", "media": f"attach://p{j}", "caption": caption[:1024]})
+                files[f"p{j}"] = (filename, data)
+            self._enqueue(
+                "sendMediaGroup",
+                {"chat_id": self.chat_id, "media": json.dumps(media)},
+                files,
+                timeout=120
+            )
+
+    def flush(self, timeout=120):
+        """等待队列中的消息全部发出（最多 timeout 秒）"""
+        if self.worker is None:
+            return
+        deadline = time.time() + timeout
+        while self.queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.1)
+
+    def flush_updates(self):
+        """刷新 offset 到最新，避免读到旧消息"""
+        if not self.ok:
+            return 0
+        try:
+            r = self.session.get(
+                f"{self.api}/getUpdates",
+                params={"timeout": 0},
+                timeout=10
+            )
+            data = r.json()
+            if data.get("ok") and data.get("result"):
+                return data["result"][-1]["update_id"] + 1
+        except:
+            pass
+        return 0
+
+    def wait_code(self, account, timeout=120):
+        """
+        等待你在 TG 里发 /code <账号> 123456
+        - 只有一个账号在等待时，/code 123456 也可以
+        - 回复某个账号的提示消息时，不用写账号
+        只接受来自 TG_CHAT_ID 的消息
+        """
+        if not self.ok:
+            return None
+
+        key = (account or "").lower()
+        waiter = queue.Queue()
+        with self.lock:
+            self.waiters[key] = waiter
+            if self.poller is None:
+                self.poller = threading.Thread(target=self._poll, name="telegram-poll", daemon=True)
+                self.poller.start()
+
+        try:
+            return waiter.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        finally:
+            with self.lock:
+                if self.waiters.get(key) is waiter:
+                    del self.waiters[key]
+                self.prompts = {mid: k for mid, k in self.prompts.items() if k != key}
+
+    def _poll(self):
+        """后台线程：唯一的 getUpdates 长轮询，没有等待者时退出"""
+        # 先刷新 offset，避免读到旧的 /code
+        offset = self.flush_updates()
+
+        while True:
+            with self.lock:
+                if not self.waiters:
+                    self.poller = None
+                    return
+
+            try:
+                r = self.session.get(
+                    f"{self.api}/getUpdates",
+                    params={"timeout": 20, "offset": offset},
+                    timeout=30
+                )
+                data = r.json()
+                if not data.get("ok"):
+                    time.sleep(2)
+                    continue
+
+                for upd in data.get("result", []):
+                    offset = upd["update_id"] + 1
+                    msg = upd.get("message") or {}
+                    chat = msg.get("chat") or {}
+                    if str(chat.get("id")) != str(self.chat_id):
+                        continue
+
+                    text = (msg.get("text") or "").strip()
+                    m = CODE_PATTERN.match(text)
+                    if m:
+                        reply_to = (msg.get("reply_to_message") or {}).get("message_id")
+                        self._dispatch(m.group(1), m.group(2), reply_to)
+
+            except Exception:
+                time.sleep(2)
+
+    def _dispatch(self, account, code, reply_to=None):
+        """把验证码交给对应的等待者"""
+        with self.lock:
+            if account:
+                key = account.lower()
+            elif reply_to in self.prompts:
+                key = self.prompts[reply_to]
+            elif len(self.waiters) == 1:
+                key = next(iter(self.waiters))
+            else:
+                key = None
+            waiter = self.waiters.get(key)
+            waiting = sorted(self.waiters)
+
+        if waiter:
+            waiter.put(code)
+        elif account:
+            self.send(f"⚠️ 账号 <b>{account}</b> 没有在等待验证码")
+        else:
+            self.send("⚠️ 多个账号在等待验证码，请发送 <code>/code 用户名 验证码</code>\n\n等待中: "
+                      + ", ".join(waiting))
+
@@ -0,0 +1,117 @@
+"""
+运行时间线
+- span("步骤名") 记录每一步的耗时、网络字节数、导航次数和截图数
+- 运行结束后以 JSON lines 追加写入 TIMELINE_FILE
+- summary() 生成附在通知里的简要耗时分布
+"""
+
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+
+TIMELINE_FILE = os.environ.get("TIMELINE_FILE", "timeline.jsonl").strip()
+
+COUNTERS = ("bytes", "navigations", "screenshots", "requests", "delay_ms", "retries", "soft_timeouts",
+            "ready_ms")
+
+
+class Timeline:
+    """单个账号一次运行的时间线"""
+
+    def __init__(self, username):
+        self.username = username
+        self.run_id = time.strftime('%Y%m%dT%H%M%S')
+        self.start = time.monotonic()
+        self.started_at = time.time()
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.spans = []
+        self.depth = 0
+        self.meta = {}  # 附加信息（如 auth 路径），写入时间线末尾
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def span(self, name):
+        """记录一个步骤；抛异常时标记失败后继续抛出"""
+        rec = {"name": name, "depth": self.depth, "offset": round(time.monotonic() - self.start, 3)}
+        before = dict(self.counters)
+        t0 = time.monotonic()
+        self.depth += 1
+        ok = True
+        try:
+            yield rec
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self.depth -= 1
+            rec["seconds"] = round(time.monotonic() - t0, 3)
+            rec["ok"] = ok
+            for k, v in self.counters.items():
+                rec[k] = v - before.get(k, 0)
+            self.spans.append(rec)
+
+    # ---------- Playwright 事件 ----------
+
+    def on_response(self, response):
+        """context.on("response")：按 content-length 累计字节数"""
+        self.count("requests")
+        try:
+            self.count("bytes", int(response.headers.get("content-length") or 0))
+        except (TypeError, ValueError):
+            pass
+
+    def watch(self, page):
+        """统计主框架导航次数"""
+        page.on("framenavigated", lambda frame: frame == page.main_frame and self.count("navigations"))
+
+    # ---------- 输出 ----------
+
+    def records(self):
+        """按开始时间排序的 JSON 记录，最后一条为整体汇总"""
+        base = {"run_id": self.run_id, "username": self.username}
+        rows = [dict(base, type="span", **s) for s in sorted(self.spans, key=lambda s: (s["offset"], s["depth"]))]
+        rows.append(dict(
+            base,
+            type="run",
+            started_at=int(self.started_at),
+            seconds=round(time.monotonic() - self.start, 3),
+            **self.counters,
+            **self.meta,
+        ))
+        return rows
+
+    def export(self, path=TIMELINE_FILE):
+        if not path:
+            return
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                for row in self.records():
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"写入时间线失败: {e}")
+
+    def summary(self, limit=8):
+        """顶层步骤的简要耗时，如 "打开登录页 3.2s · GitHub 登录 12.0s" """
+        top = sorted((s for s in self.spans if s["depth"] == 0), key=lambda s: s["offset"])
+        parts = [f"{s['name']} {s['seconds']:.1f}s" + ("" if s["ok"] else "✗") for s in top[:limit]]
+        total = time.monotonic() - self.start
+        return f"{' · '.join(parts)}\n总计 {total:.1f}s，{self.counters['navigations']} 次导航，" \
+               f"{self.counters['screenshots']} 张截图，{self.counters['bytes'] // 1024} KB，" \
+               f"人工延迟 {self.counters['delay_ms'] / 1000:.1f}s，" \
+               f"等待页面就绪 {self.counters['ready_ms'] / 1000:.1f}s" + \
+               (f"，重试 {self.counters['retries']} 次" if self.counters['retries'] else "")
+
+
+def timed(name):
+    """装饰 AutoLogin 的异步方法，把整个方法记为时间线上的一个步骤"""
+    def deco(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            with self.timeline.span(name):
+                return await fn(self, *args, **kwargs)
+        return wrapper
+    return deco
@@ -0,0 +1,67 @@
+"""
+事件驱动的等待
+- 基于 page.wait_for_url（内部监听 framenavigated），页面一跳转就返回
+- 超时返回 False 而不是抛异常，调用方按步骤决定怎么处理
+- 超时单位与 Playwright 一致（毫秒）
+"""
+
+import asyncio
+
+
+async def wait_url(page, predicate, timeout):
+    """等待当前 URL 满足 predicate(url)，满足返回 True，超时返回 False"""
+    # 只在浏览器流程中用到，调用时 Playwright 已经加载
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    if predicate(page.url):
+        return True
+    if timeout <= 0:
+        return False
+    try:
+        await page.wait_for_url(predicate, timeout=timeout, wait_until='commit')
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def wait_url_change(page, old_url, timeout):
+    """等待页面离开 old_url（点击/提交后等跳转）"""
+    return await wait_url(page, lambda url: url != old_url, timeout)
+
+
+async def wait_url_or_selector(page, predicate, selector, timeout):
+    """
+    同时等待 URL 跳转和页面元素出现（如提交后的错误提示），先到先得
+    返回 "url"、"selector" 或 None（超时）
+    """
+    if predicate(page.url):
+        return "url"
+
+    url_task = asyncio.ensure_future(wait_url(page, predicate, timeout))
+    sel_task = asyncio.ensure_future(
+        page.locator(selector).first.wait_for(state='visible', timeout=timeout)
+    )
+    try:
+        done, _ = await asyncio.wait(
+            {url_task, sel_task}, timeout=timeout / 1000, return_when=asyncio.FIRST_COMPLETED
+        )
+        if url_task in done and url_task.result():
+            return "url"
+        if sel_task in done and not sel_task.exception():
+            return "selector"
+        # 先完成的那个失败了，再看另一个是否赶上
+        if url_task in done and not sel_task.done():
+            try:
+                await sel_task
+                return "selector"
+            except Exception:
+                return None
+        if sel_task in done and not url_task.done():
+            return "url" if await url_task else None
+        return None
+    finally:
+        for t in (url_task, sel_task):
+            if not t.done():
+                t.cancel()
+        # 回收被取消任务的异常，避免 "Task exception was never retrieved"
+        await asyncio.gather(url_task, sel_task, return_exceptions=True)
@@ -0,0 +1,6 @@
+"""常驻守护进程（入口脚本，实现见 clawcloud/daemon.py）"""
+
+from clawcloud.daemon import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""离线回放录制的运行（入口脚本，实现见 clawcloud/replay.py）"""
+
+from clawcloud.replay import main
+
+if __name__ == "__main__":
+    main()
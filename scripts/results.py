@@ -0,0 +1,6 @@
+"""运行结果统计（入口脚本，实现见 clawcloud/results.py）"""
+
+from clawcloud.results import main
+
+if __name__ == "__main__":
+    main()
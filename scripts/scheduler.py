@@ -0,0 +1,6 @@
+"""按账号调度保活（入口脚本，实现见 clawcloud/scheduler.py）"""
+
+from clawcloud.scheduler import main
+
+if __name__ == "__main__":
+    main()
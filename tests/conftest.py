@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# 模块在导入时读取环境变量：先指向临时目录，避免读写真实的 .state/
+os.environ["STATE_DIR"] = tempfile.mkdtemp(prefix="clawcloud-test-")
+os.environ.setdefault("TIMELINE_FILE", "")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
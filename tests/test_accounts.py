@@ -0,0 +1,39 @@
+import json
+
+from clawcloud.runner import load_accounts, secret_key
+
+
+def test_secret_key():
+    assert secret_key("foo-bar") == "FOO_BAR"
+    assert secret_key("a.b@c") == "A_B_C"
+
+
+def test_single_account_from_env(monkeypatch):
+    monkeypatch.delenv("GH_ACCOUNTS", raising=False)
+    monkeypatch.setenv("GH_USERNAME", "alice")
+    monkeypatch.setenv("GH_PASSWORD", "pw")
+    monkeypatch.setenv("GH_SESSION", "cookie")
+    [a] = load_accounts()
+    assert (a["username"], a["password"], a["session"], a["secret_name"]) == ("alice", "pw", "cookie", "GH_SESSION")
+
+
+def test_multi_account_session_lookup(monkeypatch):
+    monkeypatch.setenv("GH_ACCOUNTS", json.dumps([
+        {"username": "al-ice", "password": "p1"},
+        {"username": "bob", "password": "p2", "session": "inline"},
+        {"username": "carol", "password": "p3"},
+        {"password": "no-name"},
+    ]))
+    monkeypatch.setenv("GH_SESSIONS", json.dumps({"GH_SESSION_AL_ICE": "from-sessions", "GH_SESSION_BOB": "x"}))
+    monkeypatch.setenv("GH_SESSION_CAROL", "from-env")
+    accounts = {a["username"]: a for a in load_accounts()}
+    assert list(accounts) == ["al-ice", "bob", "carol"]
+    assert accounts["al-ice"]["session"] == "from-sessions"
+    assert accounts["bob"]["session"] == "inline"
+    assert accounts["carol"]["session"] == "from-env"
+    assert accounts["al-ice"]["secret_name"] == "GH_SESSION_AL_ICE"
+
+
+def test_invalid_accounts_json(monkeypatch):
+    monkeypatch.setenv("GH_ACCOUNTS", "[not json")
+    assert load_accounts() == []
@@ -0,0 +1,34 @@
+from clawcloud.http_keepalive import claw_cookies, merge_cookies, signed_in_page
+
+CONSOLE = "https://ap-southeast-1.console.claw.cloud/apps"
+
+
+def test_signed_in_page_accepts_console():
+    assert signed_in_page(200, CONSOLE, b'<div class="app-list"></div>')
+
+
+def test_signed_in_page_rejects_redirects_and_errors():
+    assert not signed_in_page(302, CONSOLE, b"")
+    assert not signed_in_page(200, "https://console.run.claw.cloud/signin", b"")
+    assert not signed_in_page(200, "https://example.com/apps", b"")
+
+
+def test_signed_in_page_rejects_client_side_signin():
+    # 前端判断登录状态的控制台：未登录也是 200，只能从页面内容看出来
+    assert not signed_in_page(200, CONSOLE, b"<button>Continue with GitHub</button>")
+    assert not signed_in_page(200, CONSOLE, b'<input type="password">')
+
+
+def test_claw_cookies_and_merge():
+    state = {"cookies": [
+        {"name": "s", "value": "old", "domain": ".claw.cloud", "path": "/"},
+        {"name": "user_session", "value": "gh", "domain": "github.com", "path": "/"},
+    ]}
+    assert [c["name"] for c in claw_cookies(state)] == ["s"]
+
+    class Cookie:
+        domain, path, name, value = ".claw.cloud", "/", "s", "new"
+
+    merge_cookies(state, [Cookie()])
+    assert state["cookies"][0]["value"] == "new"
+    assert state["cookies"][1]["value"] == "gh"
@@ -0,0 +1,42 @@
+from clawcloud.results import ResultStore, failure_rates, last_success, path_stats, percentile
+
+
+def row(at, user, ok, path="cookie", seconds=1.0, region="sg", error=""):
+    return {"at": at, "run_id": "r", "username": user, "ok": ok, "error": error, "path": path,
+            "region": region, "seconds": seconds}
+
+
+def test_percentile_nearest_rank():
+    values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    assert percentile(values, 0.5) == 5
+    assert percentile([1, 2, 3, 4], 0.5) == 2
+    assert percentile(values, 0.95) == 10
+    assert percentile([7], 0.95) == 7
+
+
+def test_path_stats_only_times_successful_runs():
+    rows = [row(1, "a", True, seconds=2), row(2, "a", True, seconds=4), row(3, "a", False, seconds=99)]
+    s = path_stats(rows)["cookie"]
+    assert (s["runs"], s["ok"], s["p50"], s["p95"]) == (3, 2, 2, 4)
+
+
+def test_failure_rates_sorted_worst_first():
+    rows = [row(1, "a", True), row(2, "b", False, error="boom"), row(3, "b", True)]
+    rates = failure_rates(rows, "username")
+    assert list(rates) == ["b", "a"]
+    assert rates["b"]["rate"] == 0.5 and rates["b"]["last_error"] == "boom"
+
+
+def test_last_success_never_succeeded_first():
+    ages = last_success([row(100, "a", True), row(50, "b", False)], now=200)
+    assert ages == {"b": None, "a": 100}
+
+
+def test_store_appends_and_skips_corrupt_lines(tmp_path):
+    store = ResultStore(str(tmp_path / "results.jsonl"))
+    store.append([row(1, "a", True)])
+    with open(store.path, "a") as f:
+        f.write("{truncated\n")
+    store.append([row(5, "b", False)])
+    assert [r["username"] for r in store.read()] == ["a", "b"]
+    assert [r["username"] for r in store.read(since=3)] == ["b"]
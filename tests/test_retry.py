@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+from clawcloud.retry import Breaker, CircuitOpen, host_key, retry_sync
+
+
+def test_host_key_groups_subdomains_and_proxies():
+    assert host_key("https://ap-southeast-1.console.claw.cloud/apps") == "claw.cloud"
+    assert host_key("https://api.github.com/repos") == "api.github.com"
+    assert host_key("https://github.com/login", "http://1.2.3.4:8080") == "github.com via http://1.2.3.4:8080"
+
+
+def test_breaker_opens_and_allows_a_single_half_open_probe():
+    b = Breaker("t", threshold=2, cooldown=0.05)
+    b.failure()
+    assert b.allow()
+    b.failure()
+    assert not b.allow()
+    time.sleep(0.06)
+    assert b.allow()
+    assert not b.allow()
+    b.success()
+    assert b.allow() and b.allow()
+
+
+def test_failed_probe_reopens_the_breaker():
+    b = Breaker("t", threshold=1, cooldown=0.05)
+    b.failure()
+    time.sleep(0.06)
+    assert b.allow()
+    b.failure()
+    assert not b.allow()
+    assert b.trips == 1
+
+
+def test_retry_sync_retries_transient_errors(monkeypatch):
+    monkeypatch.setattr("clawcloud.retry.backoff", lambda i: 0)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("reset")
+        return "ok"
+
+    assert retry_sync(fn, Breaker("t", threshold=0), attempts=3) == "ok"
+    assert len(calls) == 3
+
+
+def test_retry_sync_does_not_call_through_an_open_breaker():
+    b = Breaker("t", threshold=1, cooldown=60)
+    b.failure()
+    with pytest.raises(CircuitOpen):
+        retry_sync(lambda: "ok", b)
@@ -0,0 +1,50 @@
+from clawcloud.scheduler import BACKOFF_MINUTES, KEEPALIVE_HOURS, SCHEDULE_JITTER_HOURS, Schedule
+
+
+def make(tmp_path, names, now=1000):
+    s = Schedule(str(tmp_path / "schedule.json"))
+    s.sync(names, now=now)
+    return s
+
+
+def test_new_accounts_are_due_immediately(tmp_path):
+    s = make(tmp_path, ["a", "b"])
+    assert sorted(s.pop_due(now=1000)) == ["a", "b"]
+    assert s.pop_due(now=1000) == []
+
+
+def test_pop_due_respects_limit_and_order(tmp_path):
+    s = make(tmp_path, ["a", "b", "c"])
+    s.entries["b"]["due"] = 500
+    s.rebuild()
+    assert s.pop_due(now=1000, limit=2)[0] == "b"
+
+
+def test_record_success_schedules_next_keepalive(tmp_path):
+    s = make(tmp_path, ["a"])
+    s.pop_due(now=1000)
+    s.record("a", True, now=1000)
+    due = s.entries["a"]["due"]
+    assert 1000 + (KEEPALIVE_HOURS - SCHEDULE_JITTER_HOURS) * 3600 <= due <= 1000 + KEEPALIVE_HOURS * 3600
+    assert s.pop_due(now=1000) == []
+    assert s.pop_due(now=due) == ["a"]
+
+
+def test_record_failure_backs_off_exponentially(tmp_path):
+    s = make(tmp_path, ["a"])
+    s.record("a", False, now=1000)
+    first = s.entries["a"]["due"] - 1000
+    s.record("a", False, now=1000)
+    second = s.entries["a"]["due"] - 1000
+    assert s.entries["a"]["failures"] == 2
+    assert BACKOFF_MINUTES * 60 * 0.8 <= first <= BACKOFF_MINUTES * 60 * 1.2
+    assert second > first
+
+
+def test_schedule_survives_reload(tmp_path):
+    s = make(tmp_path, ["a"])
+    s.record("a", False, now=1000)
+    s.save()
+    again = Schedule(s.path)
+    assert again.entries["a"]["failures"] == 1
+    assert again.peek() == (s.entries["a"]["due"], "a")
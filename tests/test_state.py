@@ -0,0 +1,41 @@
+import time
+
+from clawcloud.session_probe import EXPIRED, VALID, ProbeCache
+from clawcloud.state_cache import StateCache
+
+
+def test_state_cache_round_trip(tmp_path):
+    cache = StateCache("alice", "pw", directory=str(tmp_path))
+    assert cache.save({"cookies": [{"name": "a"}]}, "sg", "https://sg.claw.cloud", {"state": "oauth"})
+    data = StateCache("alice", "pw", directory=str(tmp_path)).load()
+    assert data["storage_state"] == {"cookies": [{"name": "a"}]}
+    assert data["base_url"] == "https://sg.claw.cloud"
+    assert data["state"] == "oauth"
+
+
+def test_state_cache_is_encrypted_per_account(tmp_path):
+    StateCache("alice", "pw", directory=str(tmp_path)).save({"cookies": []})
+    raw = (tmp_path / "alice.state").read_bytes()
+    assert b"cookies" not in raw
+    assert StateCache("alice", "other", directory=str(tmp_path)).load() is None
+
+
+def test_state_cache_without_secret_is_disabled(tmp_path):
+    cache = StateCache("alice", "", directory=str(tmp_path))
+    assert not cache.save({"cookies": []})
+    assert cache.load() is None
+
+
+def test_probe_cache_hits_only_matching_fingerprint(tmp_path):
+    cache = ProbeCache(str(tmp_path / "probe.json"), ttl=60)
+    cache.put("alice", "k1", VALID)
+    assert cache.get("alice", "k1") == (VALID, "")
+    assert cache.get("alice", "k2") is None
+    assert cache.get("bob", "k1") is None
+
+
+def test_probe_cache_expires(tmp_path):
+    cache = ProbeCache(str(tmp_path / "probe.json"), ttl=0.05)
+    cache.put("alice", "k1", EXPIRED)
+    time.sleep(0.06)
+    assert cache.get("alice", "k1") is None
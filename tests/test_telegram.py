@@ -0,0 +1,18 @@
+import pytest
+
+from clawcloud.telegram import CODE_PATTERN
+
+
+@pytest.mark.parametrize("text, account, code", [
+    ("/code 123456", None, "123456"),
+    ("/code alice 123456", "alice", "123456"),
+    ("/code@my_bot alice 12345678", "alice", "12345678"),
+])
+def test_code_pattern_matches(text, account, code):
+    m = CODE_PATTERN.match(text)
+    assert m and m.group(1) == account and m.group(2) == code
+
+
+@pytest.mark.parametrize("text", ["/code", "/code 12345", "/code alice", "code 123456", "/code 123456789"])
+def test_code_pattern_rejects(text):
+    assert CODE_PATTERN.match(text) is None